@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Token bucket state for one key
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+
+    def refill(self, rate, burst, now):
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+# Token buckets keyed by session or client address. Buckets for keys that
+# have not been seen recently are dropped once max_keys is reached, so memory
+# stays bounded however many clients show up.
+class RateLimiter:
+    def __init__(self, rate, burst, max_keys=10000, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+
+    def bucket(self, key):
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.burst, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.refill(self.rate, self.burst, now)
+        return bucket
+
+# Fingerprints of recently admitted payloads, bounded by count and age
+class DuplicateFilter:
+    def __init__(self, window, capacity=10000, clock=time.monotonic):
+        self.window = window
+        self.capacity = capacity
+        self.clock = clock
+        self._seen = OrderedDict()
+
+    @staticmethod
+    def fingerprint(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+    def contains(self, digest):
+        now = self.clock()
+        # Entries are in insertion order, so expired ones sit at the front
+        while self._seen:
+            oldest, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.window:
+                break
+            del self._seen[oldest]
+        return digest in self._seen
+
+    def add(self, digest):
+        self._seen[digest] = self.clock()
+        self._seen.move_to_end(digest)
+        if len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+
+# Admission control for one kind of request (e.g. "ask" or "contact").
+#
+# A request is admitted only if its payload is not a recent duplicate and
+# both its session and its client address have a token left. The checks are
+# plain dictionary lookups under one lock, so rejected requests never reach
+# the handler, the answer backend or the database.
+class Admission:
+    def __init__(self, session_rate, session_burst, client_rate, client_burst,
+                 duplicate_window, clock=time.monotonic):
+        self.sessions = RateLimiter(session_rate, session_burst, clock=clock)
+        self.clients = RateLimiter(client_rate, client_burst, clock=clock)
+        self.duplicates = DuplicateFilter(duplicate_window, clock=clock)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = {"duplicate": 0, "session": 0, "client": 0}
+
+    # Returns None when admitted, otherwise the reason for rejecting
+    def check(self, session_id, client, payload):
+        digest = DuplicateFilter.fingerprint(payload)
+        with self._lock:
+            if self.duplicates.contains(digest):
+                reason = "duplicate"
+            else:
+                session_bucket = self.sessions.bucket(session_id)
+                client_bucket = self.clients.bucket(client)
+                if session_bucket.tokens < 1:
+                    reason = "session"
+                elif client_bucket.tokens < 1:
+                    reason = "client"
+                else:
+                    session_bucket.tokens -= 1
+                    client_bucket.tokens -= 1
+                    self.duplicates.add(digest)
+                    self.admitted += 1
+                    return None
+            self.rejected[reason] += 1
+            return reason
+
+    def stats(self):
+        with self._lock:
+            return {"admitted": self.admitted, "rejected": dict(self.rejected)}
@@ -0,0 +1,98 @@
+import atexit
+import collections
+import os
+import threading
+import time
+
+import assets
+import submissions
+
+ANALYTICS_DATABASE = os.path.join(assets.DATA_DIR, "analytics.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_counts (
+    bucket INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, event, value)
+) WITHOUT ROWID;
+"""
+
+# Rolled-up event counts, added to the stored counts for the same bucket
+class EventWriter(submissions.BatchWriter):
+    schema = SCHEMA
+
+    def __init__(self, path=ANALYTICS_DATABASE, **options):
+        super().__init__(path, name="analytics-writer", **options)
+
+    def _write(self, conn, batch):
+        with conn:
+            conn.executemany(
+                "INSERT INTO event_counts (bucket, event, value, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (bucket, event, value) DO UPDATE SET count = count + excluded.count",
+                batch,
+            )
+
+# Counts what visitors look at: which sections, skill tabs, project details
+# and preset questions.
+#
+# track() appends to a bounded deque, which is safe across threads without a
+# lock, and returns; nothing on the page run waits for analytics. A
+# background thread drains the deque every `flush_interval` seconds, rolls
+# the events up into counts per (time bucket, event, value), keeps running
+# totals for the metrics endpoint and hands the rollup to the writer, so a
+# busy hour is a handful of rows rather than one per click. When the deque
+# is full the oldest events are dropped and counted in `dropped`.
+class Tracker:
+    def __init__(self, writer=None, bucket_seconds=3600, flush_interval=30.0, max_buffer=10000):
+        self.writer = writer
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._events = collections.deque(maxlen=max_buffer)
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="analytics-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # Values should come from a small, fixed set (section names, project ids),
+    # never from free text
+    def track(self, event, value):
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append((time.time(), event, str(value)))
+
+    # Roll up everything buffered so far; returns the number of events
+    def flush(self):
+        with self._lock:
+            rollup = {}
+            events = 0
+            while True:
+                try:
+                    at, event, value = self._events.popleft()
+                except IndexError:
+                    break
+                key = (int(at // self.bucket_seconds) * self.bucket_seconds, event, value)
+                rollup[key] = rollup.get(key, 0) + 1
+                events += 1
+            for (bucket, event, value), count in rollup.items():
+                self._totals[(event, value)] = self._totals.get((event, value), 0) + count
+                if self.writer is not None:
+                    self.writer.put((bucket, event, value, count))
+            return events
+
+    # {(event, value): count} since the process started, as of the last flush
+    def totals(self):
+        with self._lock:
+            return dict(self._totals)
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
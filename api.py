@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import metrics
+import profiles
+import util
+
+logger = logging.getLogger(__name__)
+
+# brotli is optional; without it responses are offered gzipped only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content served under /api/<resource>; /api/portfolio is all of them
+RESOURCES = ("profile", "education", "experience", "achievements", "certifications", "skills", "projects")
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# Keep only `fields` of a resource: of each item for a list of objects, of
+# the object itself otherwise
+def select(value, fields, name):
+    items = value if isinstance(value, list) else [value]
+    if not all(isinstance(item, dict) for item in items):
+        raise APIError(400, f"{name} has no fields to select")
+    known = {key for item in items for key in item}
+    unknown = sorted(set(fields) - known)
+    if unknown:
+        raise APIError(400, f"unknown field {unknown[0]!r} for {name}; one of {', '.join(sorted(known))}")
+    picked = [{key: item[key] for key in fields if key in item} for item in items]
+    return picked if isinstance(value, list) else picked[0]
+
+# One response body, serialized and compressed once.
+#
+# The ETag is a hash of the JSON, so it changes exactly when the content
+# does. Compressed bodies are different representations and get their own
+# strong tags (<hash>-gzip, <hash>-br); any of them matches a conditional
+# request. An encoding is only offered when it is smaller than the JSON.
+class Representation:
+    def __init__(self, value):
+        self.body = json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        self.etag = hashlib.sha256(self.body).hexdigest()[:20]
+        self.encodings = {"gzip": gzip.compress(self.body, 9, mtime=0)}
+        if brotli is not None:
+            self.encodings["br"] = brotli.compress(self.body, quality=11)
+        self.encodings = {name: data for name, data in self.encodings.items() if len(data) < len(self.body)}
+
+    def tag(self, encoding=None):
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+    # If-None-Match uses the weak comparison, so W/ tags match too
+    def matches(self, if_none_match):
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.strip('"').split("-")[0] == self.etag for tag in tags)
+
+    # Best encoding the client accepts: brotli, then gzip, else none
+    def negotiate(self, accept_encoding):
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            name, _, params = part.partition(";")
+            params = params.replace(" ", "")
+            try:
+                quality = float(params[2:]) if params.startswith("q=") else 1.0
+            except ValueError:
+                quality = 0.0
+            if quality > 0:
+                accepted.add(name.strip())
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and (encoding in accepted or "*" in accepted):
+                return encoding
+        return None
+
+# Read-only JSON API over the portfolio content, for front ends other than
+# this app.
+#
+#   GET /api/<resource>[?profile=<slug>][&fields=a,b]
+#
+# Representations are built once per (profile, content version, resource,
+# fields) and kept in an LRU, so a request is a dictionary lookup and, for a
+# polling client sending If-None-Match, a body-less 304. Profiles come from
+# the app's ProfileCache, so the API and the pages share one copy of each.
+class ContentAPI:
+    def __init__(self, profile_cache, max_entries=256):
+        self.profile_cache = profile_cache
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def representation(self, path, query):
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "api" or parts[1] not in RESOURCES + ("portfolio",):
+            raise APIError(404, f"not found; resources are /api/portfolio and /api/{{{','.join(RESOURCES)}}}")
+        resource = parts[1]
+        slug = query.get("profile", [profiles.DEFAULT])[0]
+        fields = tuple(sorted({f.strip() for value in query.get("fields", []) for f in value.split(",") if f.strip()}))
+        profile = self.profile_cache.get(slug)
+        if profile is None:
+            raise APIError(404, f"no profile {slug!r}")
+
+        key = (slug, profile.version, resource, fields)
+        with self._lock:
+            representation = self._entries.get(key)
+            if representation is not None:
+                self._entries.move_to_end(key)
+                return representation
+
+        if resource == "portfolio":
+            value = {name: profile.content[name] for name in RESOURCES}
+        else:
+            value = profile.content[resource]
+        if fields:
+            value = select(value, fields, resource)
+        representation = Representation(value)
+        with self._lock:
+            self._entries[key] = representation
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return representation
+
+    # Serve the API on a local port from a daemon thread; a second call
+    # returns the server that is already running
+    def serve(self, port, host="127.0.0.1"):
+        if self._server is not None:
+            return self._server
+        api = self
+
+        class Handler(util.QuietHandler):
+            def do_GET(self):
+                self.respond(send_body=True)
+
+            def do_HEAD(self):
+                self.respond(send_body=False)
+
+            def respond(self, send_body):
+                url = urlsplit(self.path)
+                try:
+                    representation = api.representation(url.path, parse_qs(url.query))
+                except APIError as exc:
+                    self.fail(exc.status, str(exc), send_body)
+                    return
+                except Exception:
+                    # A profile that cannot be read, a bug: the client still
+                    # gets a response rather than a dropped connection
+                    logger.exception("content API request %s failed", self.path)
+                    self.fail(500, "internal error", send_body)
+                    return
+
+                encoding = representation.negotiate(self.headers.get("Accept-Encoding", ""))
+                headers = {"ETag": representation.tag(encoding), "Vary": "Accept-Encoding"}
+                if representation.matches(self.headers.get("If-None-Match", "")):
+                    metrics.registry.count("portfolio_api_responses_total", status=304)
+                    self.reply(304, b"", headers, send_body=False)
+                    return
+                if encoding:
+                    headers["Content-Encoding"] = encoding
+                metrics.registry.count("portfolio_api_responses_total", status=200)
+                self.reply(200, representation.encodings.get(encoding, representation.body), headers, send_body)
+
+            def fail(self, status, message, send_body):
+                metrics.registry.count("portfolio_api_responses_total", status=status)
+                self.reply(status, json.dumps({"error": message}).encode("utf-8"), send_body=send_body)
+
+            def reply(self, status, body, headers=None, send_body=True):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                # Clients may keep a copy but must revalidate it, which costs a 304
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.send_header("Access-Control-Expose-Headers", "ETag")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+        self._server = util.serve_http(Handler, host, port, "content-api")
+        return self._server
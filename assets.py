@@ -0,0 +1,28 @@
+import hashlib
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STYLESHEET = os.path.join(STATIC_DIR, "style.css")
+# Databases and generated files (messages, analytics, resumes); benchmarks
+# and the static export point it at a scratch directory
+DATA_DIR = os.environ.get("PORTFOLIO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+
+# Strip comments and insignificant whitespace from a stylesheet
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+def content_hash(text, length=12):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:length]
+
+# Read, minify and fingerprint a stylesheet; returns (css, digest)
+def build_stylesheet(path=STYLESHEET):
+    with open(path, encoding="utf-8") as f:
+        css = minify_css(f.read())
+    return css, content_hash(css)
@@ -0,0 +1,204 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Keep benchmark writes (contact form) out of the real data directory
+os.environ.setdefault("PORTFOLIO_DATA_DIR", tempfile.mkdtemp(prefix="portfolio-bench-"))
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+import assets
+
+APP_FILE = os.path.join(assets.BASE_DIR, "proof.py")
+BASELINE_FILE = os.path.join(assets.BASE_DIR, "bench_baseline.json")
+
+# Metrics that do not depend on the machine; wall time is compared with its
+# own, looser threshold
+STABLE_METRICS = ("elements", "delta_bytes", "peak_kib")
+
+# Each scenario is (setup, action). Setup brings a fresh session to the
+# starting point and is not measured; action is the rerun being measured.
+def navigate(section):
+    def action(at):
+        at.sidebar.radio[0].set_value(section).run()
+    return action
+
+def on_section(section):
+    def setup(at):
+        at.run()
+        at.sidebar.radio[0].set_value(section).run()
+    return setup
+
+def switch_tab(at):
+    at.session_state["skill_tab"] = "Databases"
+    at.run()
+
+def type_question(at):
+    on_section("AI Experience")(at)
+    at.text_input[0].input("How have you used machine learning in your projects?").run()
+
+def ask(at):
+    at.button[0].click().run()
+
+def submit_contact(at):
+    at.text_input[0].input("Benchmark")
+    at.text_input[1].input("bench@example.com")
+    at.text_input[2].input("Benchmark run")
+    at.text_area[0].input(f"Benchmark message {time.time_ns()}")
+    at.button[0].click().run()
+
+SCENARIOS = {
+    "nav:Home": (lambda at: at.run(), navigate("Home")),
+    "nav:Skills": (lambda at: at.run(), navigate("Skills")),
+    "nav:Projects": (lambda at: at.run(), navigate("Projects")),
+    "nav:AI Experience": (lambda at: at.run(), navigate("AI Experience")),
+    "nav:Contact": (lambda at: at.run(), navigate("Contact")),
+    "skills:tab switch": (on_section("Skills"), switch_tab),
+    "ai:ask": (type_question, ask),
+    "contact:submit": (on_section("Contact"), submit_contact),
+}
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+# Elements on the page and the serialized size of their protos, which is
+# what the rerun sends to the browser as deltas
+def page_size(at):
+    elements = 0
+    delta_bytes = 0
+    for root in (at.main, at.sidebar, at._tree.children.get(2)):
+        if root is None:
+            continue
+        for node in walk(root):
+            proto = getattr(node, "proto", None)
+            if proto is not None:
+                delta_bytes += proto.ByteSize()
+            if not hasattr(node, "children"):
+                elements += 1
+    return elements, delta_bytes
+
+# AppTest gives every run a new ScriptCache, so each run would compile
+# proof.py again and peak_kib would mostly measure the compiler. A server
+# compiles the script once per process; share one cache between runs the same
+# way, so only the rerun itself is measured.
+SCRIPT_BYTECODE = {}
+
+def share_script_cache():
+    init = ScriptCache.__init__
+
+    def shared_init(self):
+        init(self)
+        self._cache = SCRIPT_BYTECODE
+    ScriptCache.__init__ = shared_init
+
+def new_app():
+    return AppTest.from_file(APP_FILE, default_timeout=30)
+
+def measure(name, repeat):
+    setup, action = SCENARIOS[name]
+
+    # Warm caches the way a running server would have them
+    at = new_app()
+    setup(at)
+    action(at)
+
+    times = []
+    peaks = []
+    for _ in range(repeat):
+        at = new_app()
+        setup(at)
+        start = time.perf_counter()
+        action(at)
+        times.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].message}")
+
+        # Allocation tracing slows the run down, so it gets a pass of its own
+        at = new_app()
+        setup(at)
+        tracemalloc.start()
+        action(at)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    elements, delta_bytes = page_size(at)
+    return {
+        "wall_ms": round(statistics.median(times), 2),
+        "elements": elements,
+        "delta_bytes": delta_bytes,
+        "peak_kib": round(statistics.median(peaks), 1),
+    }
+
+def compare(results, baseline, threshold, time_threshold):
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, value in metrics.items():
+            limit = time_threshold if metric == "wall_ms" else threshold
+            old = base.get(metric)
+            if old and value > old * (1 + limit):
+                regressions.append(f"{name} {metric}: {old} -> {value} (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a rerun of each section and interaction")
+    parser.add_argument("--repeat", type=int, default=5, help="measured runs per scenario (default: 5)")
+    parser.add_argument("--only", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--save", action="store_true",
+                        help="write the results as the new baseline, unless they regress against the old one")
+    parser.add_argument("--force", action="store_true",
+                        help="with --save, write the baseline even if it regresses (say why in the commit)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed growth of %s (default: 0.10)" % ", ".join(STABLE_METRICS))
+    parser.add_argument("--time-threshold", type=float, default=0.50,
+                        help="allowed growth of wall_ms (default: 0.50)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    share_script_cache()
+
+    results = {}
+    print(f"{'scenario':<20} {'wall_ms':>9} {'elements':>9} {'delta_bytes':>12} {'peak_kib':>9}")
+    for name in args.only or SCENARIOS:
+        metrics = results[name] = measure(name, args.repeat)
+        print(f"{name:<20} {metrics['wall_ms']:>9} {metrics['elements']:>9} "
+              f"{metrics['delta_bytes']:>12} {metrics['peak_kib']:>9}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif not args.save:
+        print("no baseline; run with --save to create one")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.time_threshold)
+    for line in regressions:
+        print("REGRESSION", line)
+
+    # Re-saving after every small regression would let the baseline creep;
+    # a worse baseline has to be asked for explicitly
+    if args.save:
+        if regressions and not args.force:
+            print("baseline not written; use --force to accept the regressions")
+            return 1
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
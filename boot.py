@@ -0,0 +1,79 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+
+import assets
+
+APP_FILE = os.path.join(assets.BASE_DIR, "proof.py")
+
+# Import times of the modules the app needs at boot, from `python -X
+# importtime` in a fresh interpreter. Returns (module, self_us, cumulative_us)
+# for every module imported, by self time, slowest first.
+def import_times(modules=("streamlit", "resources")):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=assets.BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return sorted(rows, key=lambda row: row[1], reverse=True)
+
+# Warm-up runs outside any session, which Streamlit warns about on every
+# cached call
+def quiet_bare_mode():
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+def profile(top):
+    rows = import_times()
+    print(f"{'import':<48} {'self_ms':>9} {'cumulative_ms':>14}")
+    for name, self_us, cumulative_us in rows[:top]:
+        print(f"{name:<48} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    print(f"{'total':<48} {sum(row[1] for row in rows) / 1000:>9.1f}")
+
+    start = time.perf_counter()
+    import resources
+    quiet_bare_mode()
+    print(f"\n{'init':<48} {'ms':>9}")
+    print(f"{'import resources':<48} {(time.perf_counter() - start) * 1000:>9.1f}")
+    for name, seconds in resources.warm_up().items():
+        print(f"{name:<48} {seconds * 1000:>9.1f}")
+
+# Warm every shared cache, then start Streamlit in this same process so the
+# first visitor finds them built. The server only starts listening (and
+# /_stcore/health only answers) once warm-up is done, and /ready on the
+# metrics port reports 503 until then.
+def serve(streamlit_args):
+    import resources
+    quiet_bare_mode()
+    resources.warm_up()
+
+    from streamlit.web import cli
+    sys.argv = ["streamlit", "run", APP_FILE, *streamlit_args]
+    sys.exit(cli.main())
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Warm up the portfolio's caches, then serve it; "
+                    "other options are passed on to `streamlit run`",
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="print import and warm-up times instead of serving")
+    parser.add_argument("--top", type=int, default=15, help="imports to list with --profile (default: 15)")
+    args, streamlit_args = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.profile:
+        profile(args.top)
+    else:
+        serve(streamlit_args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import html
+import os
+import re
+import string
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import images
+import util
+
+# HTML that is already safe to embed; everything else is escaped
+class Markup(str):
+    pass
+
+def escape(value):
+    if isinstance(value, Markup):
+        return value
+    return Markup(html.escape(str(value)))
+
+def join(parts, separator=""):
+    return Markup(escape(separator).join(escape(part) for part in parts))
+
+WHITESPACE_RE = re.compile(r"\s+")
+BLOCK_TAG_RE = re.compile(r" ?(</?(?:div|p|ul|ol|li|h[1-6]|br)\b[^>]*>) ?")
+
+# Collapse whitespace runs to one space and drop the space around block-level
+# tags, where browsers ignore it. Newlines never reach Markdown this way, so a
+# blank line in the content cannot end the HTML block early.
+def compact(markup):
+    return Markup(BLOCK_TAG_RE.sub(r"\1", WHITESPACE_RE.sub(" ", markup)))
+
+# A template parsed once into literal text and field names, with the literal
+# text compacted. Rendering is a single join; field values are escaped unless
+# they are Markup.
+class Template:
+    def __init__(self, source):
+        self.parts = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            self.parts.append((compact(literal), field))
+
+    def render(self, **fields):
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(escape(fields[field]))
+        return Markup("".join(out))
+
+# Turn nested dicts/lists into hashable tuples for use as cache keys. Markup
+# compares equal to the str with the same text but renders differently (it is
+# not escaped), so it is tagged with its class, which content cannot contain.
+def freeze(value):
+    if isinstance(value, Markup):
+        return (Markup, str(value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+# Rendered fragments shared by every session, rerun and profile, keyed by
+# component and its (frozen) input. Least recently used fragments are evicted
+# once the markup and keys together pass `max_bytes`, so hosting more
+# portfolios costs hit rate rather than memory.
+class FragmentCache:
+    def __init__(self, max_bytes=32 << 20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = util.footprint(key) + util.footprint(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+fragments = FragmentCache(int(os.environ.get("PORTFOLIO_FRAGMENT_CACHE_MB", 32)) << 20)
+
+# Memoize a component's output by its input, compacted once on the way into
+# the cache. `component.uncached(...)` renders the same markup without
+# touching the cache, for one-off output such as a partially streamed answer
+# or text a visitor typed.
+def component(func):
+    @wraps(func)
+    def render(*args, **kwargs):
+        key = (func.__name__, freeze(args), freeze(kwargs))
+        value = fragments.get(key)
+        if value is None:
+            value = compact(func(*args, **kwargs))
+            fragments.put(key, value)
+        return value
+    render.uncached = lambda *args, **kwargs: compact(func(*args, **kwargs))
+    return render
+
+HEADER = Template('<h{level} class="header-style">{text}</h{level}>')
+SUBHEADING = Template("<h3>{text}</h3>")
+LIST_ITEM = Template("<li>{item}</li>")
+BADGE = Template('<span class="badge">{skill}</span>')
+BADGE_LIST = Template('<div class="badges">{badges}</div>')
+CARD = Template('<div class="card">{title}{body}</div>')
+CARD_TITLE = Template("<h3>{title}</h3>")
+HERO = Template(
+    '<div class="hero-container">'
+    '<div class="hero-name">{name}</div>'
+    '<div class="hero-title">{title}</div>'
+    '<div class="hero-contact">{email} | {phone} | {location}</div>'
+    "</div>"
+)
+TIMELINE_ITEM = Template('<div class="timeline-item"><strong>{title}</strong>{lines}</div>')
+COURSEWORK = Template("<em>Relevant Coursework:</em> {coursework}")
+TIMELINE_META = Template('<div class="timeline-meta"><strong>{title}</strong>{lines}</div>')
+EXPERIENCE = Template(
+    "<strong>{role}</strong> | {company}<br>"
+    "<em>{period} | {location}</em>{highlights}"
+)
+ACHIEVEMENT = Template("<strong>{title}</strong><p>{description}</p>")
+LABELLED_ITEM = Template("<strong>{label}:</strong> {text}")
+PROJECT_CARD = Template(
+    '<div class="project-card">{image}'
+    '<div class="project-title">{title}</div>{tech}'
+    "<p>{summary}</p>{highlights}"
+    "</div>"
+)
+PICTURE = Template(
+    "<picture>{sources}"
+    '<img src="{src}" srcset="{srcset}" sizes="{sizes}" width="{width}" height="{height}" '
+    'alt="{alt}" loading="lazy" decoding="async">'
+    "</picture>"
+)
+PICTURE_SOURCE = Template('<source type="{type}" srcset="{srcset}" sizes="{sizes}">')
+SEARCH_SNIPPET = Template('<div class="search-snippet">{text}</div>')
+MARK = Template("<mark>{text}</mark>")
+TECH_STACK = Template('<div class="tech-stack">{tech}</div>')
+CHAT_MESSAGE = Template('<div class="chat-message {role}-message"><p>{text}</p></div>')
+AVAILABILITY = Template("<p>I'm currently open to:</p>{items}")
+CONTACT_LINE = Template("<p><strong>{label}:</strong> {value}</p>")
+LINK = Template('<a href="{url}" target="_blank">{text}</a>')
+PROFICIENCY_ROW = Template(
+    '<div class="proficiency-name">{name}</div>'
+    '<div class="proficiency-bar" role="progressbar" aria-valuenow="{level}" '
+    'aria-valuemin="0" aria-valuemax="100"><div style="width:{level}%"></div></div>'
+)
+
+def lines_after_title(lines):
+    return Markup("".join("<br>" + escape(line) for line in lines))
+
+@component
+def header(text, level=2):
+    return HEADER.render(level=level, text=text)
+
+@component
+def subheading(text):
+    return SUBHEADING.render(text=text)
+
+@component
+def html_list(items):
+    return Markup("<ul>" + "".join(LIST_ITEM.render(item=item) for item in items) + "</ul>")
+
+@component
+def badge_list(skills):
+    return BADGE_LIST.render(badges=join(BADGE.render(skill=skill) for skill in skills))
+
+@component
+def card(body, title=None):
+    return CARD.render(title=CARD_TITLE.render(title=title) if title else Markup(), body=body)
+
+@component
+def hero(profile):
+    return HERO.render(**{k: profile[k] for k in ("name", "title", "email", "phone", "location")})
+
+# Left column of an education entry: institution, then one line per detail
+@component
+def timeline_item(title, lines=()):
+    return TIMELINE_ITEM.render(title=title, lines=lines_after_title(lines))
+
+@component
+def education_item(school):
+    lines = []
+    if "degree" in school:
+        lines.append(school["degree"])
+    if "coursework" in school:
+        lines.append(COURSEWORK.render(coursework=school["coursework"]))
+    return timeline_item(school["institution"], lines)
+
+# Right-aligned dates and results next to a timeline item
+@component
+def timeline_meta(title, lines=()):
+    return TIMELINE_META.render(title=title, lines=lines_after_title(lines))
+
+@component
+def experience_card(job):
+    return card(EXPERIENCE.render(
+        role=job["role"],
+        company=job["company"],
+        period=job["period"],
+        location=job["location"],
+        highlights=html_list(job["highlights"]),
+    ))
+
+@component
+def achievements_card(items):
+    return card(join(ACHIEVEMENT.render(**item) for item in items))
+
+@component
+def labelled_list(items):
+    return html_list([LABELLED_ITEM.render(**item) for item in items])
+
+def srcset(variants):
+    return ", ".join(f"{images.IMAGE_URL}/{name} {width}w" for name, width in variants)
+
+# Responsive image from an images.build_variants() manifest: one <source> per
+# modern format and a fallback <img>, so the browser fetches only the format
+# and width it needs. `sizes` is the rendered width, for choosing the variant.
+@component
+def picture(image, alt, sizes="(max-width: 768px) 100vw, 50vw"):
+    *modern, (_, fallback_type, _) = images.FORMATS
+    sources = join(
+        PICTURE_SOURCE.render(type=mime, srcset=srcset(image["variants"][mime]), sizes=sizes)
+        for _, mime, _ in modern
+    )
+    fallback = image["variants"][fallback_type]
+    # Default src: the smallest variant at least 640px wide
+    src = next((name for name, width in fallback if width >= 640), fallback[-1][0])
+    return PICTURE.render(
+        sources=sources,
+        src=f"{images.IMAGE_URL}/{src}",
+        srcset=srcset(fallback),
+        sizes=sizes,
+        width=image["width"],
+        height=image["height"],
+        alt=alt,
+    )
+
+@component
+def project_card(project, image=None):
+    tech = Markup()
+    if project.get("tech_stack"):
+        tech = TECH_STACK.render(tech=", ".join(project["tech_stack"]))
+    return PROJECT_CARD.render(
+        image=picture(image, f"Screenshot of {project['title']}") if image else Markup(),
+        title=project["title"],
+        tech=tech,
+        summary=project["summary"],
+        highlights=html_list(project["highlights"]),
+    )
+
+# `screenshots` maps project ids to screenshot manifests
+@component
+def project_cards(projects, screenshots=None):
+    screenshots = screenshots or {}
+    return join(project_card(project, screenshots.get(project.get("id"))) for project in projects)
+
+@component
+def chat_message(text, role):
+    return CHAT_MESSAGE.render(role=role, text=text)
+
+# A block of earlier Q&A exchanges as one element. Questions are whatever
+# visitors typed, so they are rendered uncached and kept out of the shared
+# fragment cache; answers come from the answer bank and are cached.
+def chat_history(exchanges):
+    return join(message for question, answer in exchanges
+                for message in (chat_message.uncached(question, "user"), chat_message(answer, "ai")))
+
+@component
+def contact_card(profile):
+    linkedin = profile["linkedin"].split("://", 1)[-1]
+    lines = [
+        CONTACT_LINE.render(label="Email", value=profile["email"]),
+        CONTACT_LINE.render(label="Phone", value=profile["phone"]),
+        CONTACT_LINE.render(label="Location", value=profile["location"]),
+        CONTACT_LINE.render(label="LinkedIn", value=LINK.render(url=profile["linkedin"], text=linkedin)),
+    ]
+    return card(join(lines), title="Contact Information")
+
+@component
+def availability_card(items):
+    return card(AVAILABILITY.render(items=html_list(items)), title="Availability")
+
+# All proficiency bars as one element: a two-column grid of names and bars,
+# so the element count stays at one however many skills are listed
+@component
+def proficiency_chart(items):
+    return Markup('<div class="proficiency">' + join(PROFICIENCY_ROW.render(**item) for item in items) + "</div>")
+
+# A search result's text window, with matched words in <mark>
+@component
+def search_snippet(pieces):
+    return SEARCH_SNIPPET.render(text=join(MARK.render(text=text) if hit else text for text, hit in pieces))
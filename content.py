@@ -0,0 +1,133 @@
+import json
+import os
+
+import assets
+
+CONTENT_FILE = os.path.join(assets.BASE_DIR, "content.json")
+# Project screenshots must live here; they are published under static/img
+SCREENSHOT_DIR = os.path.join(assets.BASE_DIR, "screenshots")
+
+# Shape of content.json. Dicts list their keys (a trailing "?" marks an
+# optional key), a one-element list means "list of", and types are leaves.
+SCHEMA = {
+    "profile": {
+        "name": str,
+        "title": str,
+        "email": str,
+        "phone": str,
+        "location": str,
+        "linkedin": str,
+        "github": str,
+        "summary": str,
+    },
+    "education": [{
+        "institution": str,
+        "degree?": str,
+        "coursework?": str,
+        "period": str,
+        "results": [str],
+    }],
+    "experience": [{
+        "role": str,
+        "company": str,
+        "period": str,
+        "location": str,
+        "highlights": [str],
+    }],
+    "achievements": [{"title": str, "description": str}],
+    "certifications": [str],
+    "skills": {
+        "categories": [{"name": str, "skills": [str], "details": [str]}],
+        "proficiency": [{"name": str, "level": int}],
+    },
+    "projects": [{
+        "id": str,
+        "title": str,
+        "tech_stack": [str],
+        "summary": str,
+        "highlights": [str],
+        "featured": bool,
+        "screenshot?": str,
+        "details": [{"heading": str, "items": [str]}],
+    }],
+    "ai": {
+        "skills": [{"label": str, "text": str}],
+        "interests": [str],
+        "projects": [{"title": str, "summary": str, "highlights": [str]}],
+    },
+    "qa": {
+        "answers": [{"question": str, "match": str, "answer": str}],
+        "fallback": str,
+    },
+    "contact": {"availability": [str]},
+}
+
+class ContentError(ValueError):
+    pass
+
+def validate(value, schema, path="content"):
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            raise ContentError(f"{path}: expected an object")
+        for key, sub in schema.items():
+            optional = key.endswith("?")
+            name = key.rstrip("?")
+            if name not in value:
+                if optional:
+                    continue
+                raise ContentError(f"{path}.{name}: missing")
+            validate(value[name], sub, f"{path}.{name}")
+    elif isinstance(schema, list):
+        if not isinstance(value, list):
+            raise ContentError(f"{path}: expected a list")
+        for i, item in enumerate(value):
+            validate(item, schema[0], f"{path}[{i}]")
+    elif schema is int:
+        # bool is an int subclass; a level of `true` is a content bug
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ContentError(f"{path}: expected an integer")
+    elif not isinstance(value, schema):
+        raise ContentError(f"{path}: expected {schema.__name__}")
+
+# Absolute path of a screenshot given relative to the repository root, or
+# None if it resolves (through "..", an absolute path or a symlink) to
+# anywhere outside SCREENSHOT_DIR
+def screenshot_path(relative):
+    root = os.path.realpath(SCREENSHOT_DIR)
+    path = os.path.realpath(os.path.join(assets.BASE_DIR, relative))
+    return path if path.startswith(root + os.sep) else None
+
+def check_screenshot(path, where):
+    if path is None:
+        raise ContentError(f"{where}: must be a file under screenshots/")
+    if not os.path.isfile(path):
+        raise ContentError(f"{where}: no such file")
+    # Pillow is only needed when content has screenshots
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except (OSError, UnidentifiedImageError, SyntaxError) as exc:
+        raise ContentError(f"{where}: not a readable image ({exc})") from exc
+
+# Parse and validate the content file; raises ContentError on bad content
+def load(path=CONTENT_FILE):
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as exc:  # invalid JSON or not UTF-8
+            raise ContentError(f"{os.path.basename(path)}: {exc}") from exc
+    validate(data, SCHEMA)
+
+    project_ids = [p["id"] for p in data["projects"]]
+    if len(set(project_ids)) != len(project_ids):
+        raise ContentError("content.projects: duplicate project id")
+    for i, project in enumerate(data["projects"]):
+        # Screenshot paths are relative to the repository root
+        if "screenshot" in project:
+            check_screenshot(screenshot_path(project["screenshot"]), f"content.projects[{i}].screenshot")
+    for i, item in enumerate(data["skills"]["proficiency"]):
+        if not 0 <= item["level"] <= 100:
+            raise ContentError(f"content.skills.proficiency[{i}].level: must be 0-100")
+    return data
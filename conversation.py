@@ -0,0 +1,122 @@
+import logging
+import os
+import sqlite3
+
+import assets
+import submissions
+
+logger = logging.getLogger(__name__)
+
+# Longest question and answer kept per exchange; preset answers are far
+# shorter, so this only trims what a visitor types
+MAX_QUESTION = 300
+MAX_ANSWER = 2000
+
+# One visitor's Q&A exchanges, newest last, in a fixed-capacity ring buffer.
+#
+# Each exchange is a (question, answer) pair. Answers are the strings the
+# answer cache already holds, so a record costs two references; slicing to
+# the caps returns the same string when it is short enough. The slot list is
+# allocated once and old exchanges are overwritten in place, so memory is
+# bounded by `capacity` however long a visitor chats. Exchanges are numbered
+# from 0 in the order they were asked, which lets the page group them into
+# stable blocks.
+class Conversation:
+    __slots__ = ("capacity", "total", "_slots")
+
+    def __init__(self, capacity=20):
+        self.capacity = capacity
+        self.total = 0
+        self._slots = [None] * capacity
+
+    def append(self, question, answer):
+        seq = self.total
+        self._slots[seq % self.capacity] = (question[:MAX_QUESTION], answer[:MAX_ANSWER])
+        self.total += 1
+        return seq
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def first(self):
+        return self.total - len(self)
+
+    # (seq, question, answer), oldest first; a restored conversation may have
+    # gaps where a write was dropped
+    def __iter__(self):
+        for seq in range(self.first(), self.total):
+            record = self._slots[seq % self.capacity]
+            if record is not None:
+                yield seq, *record
+
+    # Retained exchanges grouped by seq // size. Every block but the last is
+    # complete, so it renders to the same markup on every rerun.
+    def blocks(self, size):
+        block = []
+        for seq, question, answer in self:
+            if block and seq % size == 0:
+                yield tuple(block)
+                block = []
+            block.append((question, answer))
+        if block:
+            yield tuple(block)
+
+CHAT_DATABASE = os.path.join(assets.DATA_DIR, "conversations.db")
+
+CHAT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exchanges (
+    conversation TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    PRIMARY KEY (conversation, seq)
+) WITHOUT ROWID;
+"""
+
+# Conversations saved to SQLite so they survive a reload or reconnect.
+#
+# Writes go through the shared background writer, so asking never waits on
+# the disk; each batch also deletes the exchanges that have fallen out of
+# the ring, so a conversation never holds more than `capacity` rows.
+class ConversationStore(submissions.BatchWriter):
+    schema = CHAT_SCHEMA
+
+    def __init__(self, path=CHAT_DATABASE, capacity=20, **options):
+        super().__init__(path, name="conversation-writer", **options)
+        self.capacity = capacity
+
+    def record(self, conversation, seq, question, answer):
+        return self.put((conversation, seq, question[:MAX_QUESTION], answer[:MAX_ANSWER]))
+
+    def _write(self, conn, batch):
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO exchanges (conversation, seq, question, answer) VALUES (?, ?, ?, ?)",
+                batch,
+            )
+            conn.executemany(
+                "DELETE FROM exchanges WHERE conversation = ? AND seq <= ?",
+                [(row[0], row[1] - self.capacity) for row in batch],
+            )
+
+    # The saved conversation, or an empty one if there is none
+    def load(self, conversation):
+        restored = Conversation(self.capacity)
+        if not os.path.exists(self.path):
+            return restored
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT seq, question, answer FROM exchanges WHERE conversation = ?1 AND seq > "
+                "(SELECT MAX(seq) FROM exchanges WHERE conversation = ?1) - ?2 ORDER BY seq",
+                (conversation, self.capacity),
+            ).fetchall()
+        except sqlite3.Error:
+            logger.exception("loading conversation %s failed", conversation)
+            return restored
+        finally:
+            conn.close()
+        for seq, question, answer in rows:
+            restored.total = seq
+            restored.append(question, answer)
+        return restored
@@ -0,0 +1,286 @@
+import argparse
+import atexit
+import html
+import os
+import re
+import shutil
+import tempfile
+from urllib.parse import urlencode
+
+# The export drives the real app, which tracks page views, builds a resume
+# and so on; keep all of that out of the real data directory. Registered
+# before the app's writers, so it runs after they have flushed at exit.
+os.environ["PORTFOLIO_DATA_DIR"] = tempfile.mkdtemp(prefix="portfolio-export-")
+atexit.register(shutil.rmtree, os.environ["PORTFOLIO_DATA_DIR"], ignore_errors=True)
+
+from streamlit.proto.Block_pb2 import Block
+from streamlit.testing.v1 import AppTest
+
+import assets
+import content
+import images
+import profiles
+
+APP_FILE = os.path.join(assets.BASE_DIR, "proof.py")
+
+SECTIONS = ["Home", "Skills", "Projects", "AI Experience", "Contact"]
+
+# Widgets that need a Python session; in the static export they are replaced
+# by a link into the live app
+INTERACTIVE_ELEMENTS = {"selectbox", "text_input", "text_area", "form"}
+
+# Layout rules for the structures Streamlit normally draws itself
+EXPORT_CSS = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; background: #F8F9FA; color: #333333; }
+.layout { display: flex; min-height: 100vh; }
+.sidebar { width: 240px; padding: 1.5rem; background: #F0F2F6; flex-shrink: 0; }
+.sidebar nav a { display: block; padding: 0.3rem 0; color: var(--dark-text); text-decoration: none; }
+.sidebar nav a.active { color: var(--accent-color); font-weight: 600; }
+.content { flex: 1; padding: 2rem 3rem; max-width: 1100px; }
+.row { display: flex; gap: 1rem; }
+.row > .col { min-width: 0; }
+.tab-bar button { border: none; background: none; padding: 0.5rem 1rem; cursor: pointer; border-bottom: 2px solid transparent; }
+.tab-bar button.active { border-bottom-color: var(--accent-color); color: var(--accent-color); }
+.tab-panel[hidden] { display: none; }
+details { border: 1px solid #ddd; border-radius: 5px; padding: 0.5rem 1rem; margin-bottom: 15px; }
+.progress { background: #e9ecef; border-radius: 4px; height: 0.5rem; margin: 0.6rem 0; }
+.progress > div { background: var(--accent-color); border-radius: 4px; height: 100%; }
+.interactive { border: 1px dashed var(--accent-color); border-radius: 8px; padding: 1rem; margin-bottom: 20px; }
+@media (max-width: 768px) { .layout, .row { flex-direction: column; } .sidebar { width: auto; } }
+"""
+
+# Tab switching is the only behaviour the static pages need from the browser
+TABS_JS = """
+document.querySelectorAll(".tabs").forEach(function (tabs) {
+  var buttons = tabs.querySelectorAll(".tab-bar button");
+  var panels = tabs.querySelectorAll(".tab-panel");
+  buttons.forEach(function (button, i) {
+    button.addEventListener("click", function () {
+      buttons.forEach(function (b, j) { b.classList.toggle("active", i === j); });
+      panels.forEach(function (p, j) { p.hidden = i !== j; });
+    });
+  });
+});
+"""
+
+def page_name(section):
+    if section == "Home":
+        return "index.html"
+    return section.lower().replace(" ", "-") + ".html"
+
+# Inline Markdown used by st.write/st.markdown: bold, emphasis and links
+def render_inline(text):
+    text = html.escape(text, quote=False)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"(?<!\*)\*(?!\*)(.+?)\*", r"<em>\1</em>", text)
+    text = re.sub(r"\[(.+?)\]\((.+?)\)", r'<a href="\2" target="_blank">\1</a>', text)
+    return text
+
+# Small Markdown subset: raw HTML, headings, rules, bullet lists, paragraphs
+def render_markdown(body, allow_html):
+    body = body.strip()
+    if allow_html and body.startswith("<"):
+        return body
+
+    out = []
+    items = []
+    paragraph = []
+
+    def flush():
+        if items:
+            out.append("<ul>" + "".join(f"<li>{render_inline(i)}</li>" for i in items) + "</ul>")
+            items.clear()
+        if paragraph:
+            out.append(f"<p>{render_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    for line in body.splitlines():
+        stripped = line.strip()
+        heading = re.match(r"(#{1,6})\s+(.*)", stripped)
+        if not stripped:
+            # Blank lines between bullets keep the list open
+            if not items:
+                flush()
+        elif stripped == "---":
+            flush()
+            out.append("<hr>")
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+        elif stripped.startswith("- "):
+            if paragraph:
+                flush()
+            items.append(stripped[2:])
+        elif items and line.startswith(" "):
+            items[-1] += " " + stripped
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+    flush()
+    return "\n".join(out)
+
+def active_class(active):
+    return ' class="active"' if active else ""
+
+def interactive_placeholder(section, backend_url, profile=profiles.DEFAULT):
+    query = {"section": section}
+    if profile != profiles.DEFAULT:
+        query["profile"] = profile
+    link = f"{backend_url.rstrip('/')}/?{urlencode(query)}"
+    return (
+        '<div class="interactive">This part of the page is interactive. '
+        f'<a href="{html.escape(link)}">Open it in the live app</a>.</div>'
+    )
+
+# Turn a node of the AppTest element tree into static HTML
+def render_node(node, section, backend_url, state):
+    kind = node.type
+    children = list(getattr(node, "children", {}).values())
+
+    if kind == "button":
+        # Standalone buttons (e.g. "View Demo") only trigger a rerun
+        return ""
+    if kind in INTERACTIVE_ELEMENTS:
+        # Consecutive widgets (e.g. selectbox + text input + button) share one link
+        if state.get("interactive"):
+            return ""
+        state["interactive"] = True
+        return interactive_placeholder(section, backend_url, state.get("profile", profiles.DEFAULT))
+    state["interactive"] = False
+
+    if kind == "markdown":
+        return render_markdown(node.proto.body, node.proto.allow_html)
+    if kind == "html":
+        return node.proto.body
+    if kind == "progress":
+        return f'<div class="progress"><div style="width: {int(node.value)}%;"></div></div>'
+
+    inner = [render_node(child, section, backend_url, state) for child in children]
+    if kind == "flex_container":
+        # Columns are horizontal containers; fragments are vertical ones
+        if node.proto.flex_container.direction != Block.FlexContainer.Direction.HORIZONTAL:
+            return "".join(inner)
+        return '<div class="row">' + "".join(inner) + "</div>"
+    if kind == "column":
+        return f'<div class="col" style="flex: {node.proto.weight};">' + "".join(inner) + "</div>"
+    if kind == "expander":
+        return f"<details><summary>{html.escape(node.label)}</summary>" + "".join(inner) + "</details>"
+    if kind == "tab_container":
+        if node.proto.tab_container.id.count("-") >= 2:
+            # Lazy tabs only build the open tab, so open each one in turn
+            inner = [render_lazy_tab(node.proto.tab_container.id, tab.label, section, backend_url, state)
+                     for tab in children]
+        buttons = "".join(
+            f'<button type="button"{active_class(i == 0)}>{html.escape(tab.label)}</button>'
+            for i, tab in enumerate(children)
+        )
+        panels = "".join(
+            f'<div class="tab-panel"{"" if i == 0 else " hidden"}>{body}</div>'
+            for i, body in enumerate(inner)
+        )
+        return f'<div class="tabs"><div class="tab-bar">{buttons}</div>{panels}</div>'
+    return "".join(inner)
+
+def find_block(node, block_id):
+    if getattr(node, "type", None) == "tab_container" and node.proto.tab_container.id == block_id:
+        return node
+    for child in getattr(node, "children", {}).values():
+        found = find_block(child, block_id)
+        if found is not None:
+            return found
+    return None
+
+# Select one tab of a keyed st.tabs widget and render what it builds
+def render_lazy_tab(block_id, label, section, backend_url, state):
+    app = state["app"]
+    # Widget ids look like "$$ID-<hash>-<user key>"
+    app.session_state[block_id.split("-", 2)[2]] = label
+    app.run()
+    container = find_block(app.main, block_id)
+    tab = next(t for t in container.children.values() if t.label == label)
+    return "".join(render_node(child, section, backend_url, state) for child in tab.children.values())
+
+def render_page(section, main_html, sidebar_html, css_name, name):
+    links = "".join(
+        f'<a href="{page_name(s)}"{active_class(s == section)}>{html.escape(s)}</a>'
+        for s in SECTIONS
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(section)} | {html.escape(name)} | Portfolio</title>
+<link rel="stylesheet" href="{css_name}">
+</head>
+<body>
+<div class="layout">
+<aside class="sidebar"><h3>Navigation</h3><nav>{links}</nav>{sidebar_html}</aside>
+<main class="content">{main_html}</main>
+</div>
+<script src="tabs.js" defer></script>
+</body>
+</html>
+"""
+
+# Drive the app headlessly once per section and write every page of the
+# portfolio `profile` to out_dir
+def export_site(out_dir, backend_url, profile=profiles.DEFAULT):
+    path = profiles.profile_path(profile)
+    if path is None:
+        raise ValueError(f"no profile {profile!r}; available: {', '.join(profiles.available())}")
+    name = content.load(path)["profile"]["name"]
+    os.makedirs(out_dir, exist_ok=True)
+
+    css = assets.build_stylesheet()[0] + assets.minify_css(EXPORT_CSS)
+    css_name = f"style.{assets.content_hash(css)}.css"
+    with open(os.path.join(out_dir, css_name), "w", encoding="utf-8") as f:
+        f.write(css)
+    with open(os.path.join(out_dir, "tabs.js"), "w", encoding="utf-8") as f:
+        f.write(TABS_JS.lstrip())
+    # Screenshot variants keep the path the app serves them at; their names
+    # are content-hashed, so the host can cache them indefinitely
+    if os.path.isdir(images.IMAGE_DIR):
+        shutil.copytree(images.IMAGE_DIR, os.path.join(out_dir, images.IMAGE_URL), dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("*.json"))
+
+    at = AppTest.from_file(APP_FILE, default_timeout=30)
+    at.query_params["profile"] = profile
+    at.run()
+    written = []
+    for section in SECTIONS:
+        at.sidebar.radio[0].set_value(section).run()
+        if at.exception:
+            raise RuntimeError(f"{section}: {at.exception[0].message}")
+
+        main_html = render_node(at.main, section, backend_url, {"app": at, "profile": profile})
+        # Search and navigation come first in the sidebar, up to the
+        # navigation radio; the page header replaces them
+        sidebar_nodes = list(at.sidebar.children.values())
+        radio = next(i for i, n in enumerate(sidebar_nodes) if n.type == "radio")
+        sidebar_nodes = sidebar_nodes[radio + 1:]
+        sidebar_html = "".join(render_node(n, section, backend_url, {"profile": profile}) for n in sidebar_nodes)
+
+        path = os.path.join(out_dir, page_name(section))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_page(section, main_html, sidebar_html, css_name, name))
+        written.append(path)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the portfolio as static HTML pages")
+    parser.add_argument("--out", default="site", help="output directory (default: site)")
+    parser.add_argument(
+        "--backend-url",
+        default="http://localhost:8501",
+        help="URL of the running Streamlit app that serves the Q&A box and contact form",
+    )
+    parser.add_argument("--profile", default=profiles.DEFAULT,
+                        help="portfolio to export, as in ?profile= (default: %(default)s)")
+    args = parser.parse_args()
+    if profiles.profile_path(args.profile) is None:
+        parser.error(f"no profile {args.profile!r}; available: {', '.join(profiles.available())}")
+    for path in export_site(args.out, args.backend_url, args.profile):
+        print(path)
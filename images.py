@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+
+import assets
+import util
+
+IMAGE_DIR = os.path.join(assets.STATIC_DIR, "img")
+# Where Streamlit serves IMAGE_DIR (server.enableStaticServing), relative to
+# the page; the static export copies the variants to the same path
+IMAGE_URL = "app/static/img"
+
+WIDTHS = (320, 640, 960, 1280)
+# (extension, MIME type, Pillow save options), best compression first; the
+# last format is the <img> fallback for browsers that support none of the others
+FORMATS = (
+    ("webp", "image/webp", {"quality": 80, "method": 6}),
+    ("jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+def file_hash(path, length=12):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+# JPEG has no alpha channel, so transparent screenshots go on white
+def flatten(image):
+    from PIL import Image
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+# Resize a source image into every width and format, once.
+#
+# Variants are named <stem>-<content hash>-<width>.<ext>, so a URL never
+# changes meaning and can be cached for as long as the client likes. The
+# manifest (dimensions and variant names) is written last; if it exists,
+# every variant does too and the source is not even opened.
+def build_variants(source, out_dir=IMAGE_DIR):
+    digest = file_hash(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    manifest_path = os.path.join(out_dir, f"{stem}-{digest}.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    # Pillow is only needed when a screenshot is new or has changed
+    from PIL import Image
+
+    os.makedirs(out_dir, exist_ok=True)
+    variants = {mime: [] for _, mime, _ in FORMATS}
+    with Image.open(source) as original:
+        image = flatten(original)
+    widths = sorted({min(width, image.width) for width in WIDTHS})
+    for width in widths:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for ext, mime, options in FORMATS:
+            name = f"{stem}-{digest}-{width}.{ext}"
+            util.write_atomic(os.path.join(out_dir, name),
+                         lambda f: resized.save(f, format=Image.registered_extensions()["." + ext], **options))
+            variants[mime].append([name, width])
+
+    manifest = {
+        "width": widths[-1],
+        "height": round(image.height * widths[-1] / image.width),
+        "variants": variants,
+    }
+    util.write_atomic(manifest_path, lambda f: f.write(json.dumps(manifest, sort_keys=True).encode("utf-8")))
+    return manifest
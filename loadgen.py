@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+import assets
+
+BOOT_FILE = os.path.join(assets.BASE_DIR, "boot.py")
+
+with open(os.path.join(assets.BASE_DIR, "content.json"), encoding="utf-8") as f:
+    CONTENT = json.load(f)
+
+SKILL_TABS = [category["name"] for category in CONTENT["skills"]["categories"]]
+PRESET_QUESTIONS = [entry["question"] for entry in CONTENT["qa"]["answers"]]
+FREE_TEXT_QUESTIONS = [
+    "Which vector databases have you worked with?",
+    "How would you evaluate an LLM application?",
+    "What did you build with FastAPI?",
+    "Have you fine-tuned any models?",
+]
+
+# Widget elements the visitor scripts interact with, by proto field
+WIDGETS = ("radio", "selectbox", "text_input", "text_area", "button")
+
+# One simulated browser tab, speaking Streamlit's websocket protocol: every
+# interaction is a rerun_script BackMsg carrying all widget values, answered
+# by deltas and a script_finished message.
+class Session:
+    def __init__(self, url, client_ip, timeout):
+        self.url = url
+        self.client_ip = client_ip
+        self.timeout = timeout
+        self.widgets = {}  # label -> (kind, widget id, fragment id)
+        self.states = {}  # widget id -> WidgetState
+        self.alerts = 0
+        self.ws = None
+
+    async def __aenter__(self):
+        self.ws = await connect(
+            self.url, subprotocols=["streamlit"], max_size=None,
+            additional_headers={"X-Forwarded-For": self.client_ip},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    def learn(self, delta):
+        fragment_id = delta.fragment_id
+        if delta.HasField("new_element"):
+            kind = delta.new_element.WhichOneof("type")
+            # Rejections and validation errors are shown as info/warning/error
+            if kind == "alert" and delta.new_element.alert.format != delta.new_element.alert.SUCCESS:
+                self.alerts += 1
+            elif kind in WIDGETS:
+                widget = getattr(delta.new_element, kind)
+                self.widgets[widget.label] = (kind, widget.id, fragment_id)
+        elif delta.HasField("add_block") and delta.add_block.HasField("tab_container"):
+            self.widgets["tabs"] = ("tabs", delta.add_block.tab_container.id, fragment_id)
+
+    # Send one rerun and wait for it to finish; returns seconds taken
+    async def rerun(self, trigger=None, fragment_id=""):
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.fragment_id = fragment_id
+        state.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            state.widget_states.widgets.add(id=trigger, trigger_value=True)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            data = await asyncio.wait_for(self.ws.recv(), self.timeout)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self.learn(forward.delta)
+            elif kind == "script_finished":
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - start
+
+    def widget(self, label):
+        if label not in self.widgets:
+            raise LookupError(f"no widget {label!r} on the page")
+        return self.widgets[label]
+
+    # Set a value without rerunning, as form fields do until submitted
+    def fill(self, label, value):
+        _, widget_id, _ = self.widget(label)
+        self.states[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    async def set(self, label, value):
+        self.fill(label, value)
+        return await self.rerun(fragment_id=self.widget(label)[2])
+
+    async def click(self, label):
+        _, widget_id, fragment_id = self.widget(label)
+        return await self.rerun(trigger=widget_id, fragment_id=fragment_id)
+
+# Visitor scripts: lists of (step name, coroutine factory) run in order
+def browse(rng):
+    return [
+        ("open", lambda s: s.rerun()),
+        ("nav", lambda s: s.set("Navigation", "Skills")),
+        ("tab", lambda s: s.set("tabs", rng.choice(SKILL_TABS[1:]))),
+        ("nav", lambda s: s.set("Navigation", "Projects")),
+        ("nav", lambda s: s.set("Navigation", "AI Experience")),
+        ("nav", lambda s: s.set("Navigation", "Contact")),
+        ("nav", lambda s: s.set("Navigation", "Home")),
+    ]
+
+def ask(rng):
+    return [
+        ("open", lambda s: s.rerun()),
+        ("nav", lambda s: s.set("Navigation", "AI Experience")),
+        ("select", lambda s: s.set("Select a question:", rng.choice(PRESET_QUESTIONS))),
+        ("ask", lambda s: s.click("Ask")),
+        ("type", lambda s: s.set("Or type your own question:", rng.choice(FREE_TEXT_QUESTIONS))),
+        ("ask", lambda s: s.click("Ask")),
+    ]
+
+def contact(rng):
+    def submit(s):
+        s.fill("Name", "Load Test")
+        s.fill("Email", "load@example.com")
+        s.fill("Subject", "Load test")
+        s.fill("Message", f"Load test message {rng.random()}")
+        return s.click("Send Message")
+    return [
+        ("open", lambda s: s.rerun()),
+        ("nav", lambda s: s.set("Navigation", "Contact")),
+        ("submit", submit),
+    ]
+
+SCRIPTS = {"browse": (browse, 0.6), "ask": (ask, 0.3), "contact": (contact, 0.1)}
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# Resident set size and CPU seconds of a process, from /proc (Linux only)
+def process_usage(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            rss_kib = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, StopIteration):
+        return None
+    return rss_kib, cpu
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.rejections = 0
+        self.peak_rss_kib = 0
+
+    def record(self, step, seconds):
+        self.latencies.setdefault(step, []).append(seconds)
+
+    def error(self, exc):
+        name = type(exc).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+async def visitor(number, args, stats, rng):
+    await asyncio.sleep(args.ramp * number / args.sessions)
+    names = list(SCRIPTS)
+    weights = [SCRIPTS[name][1] for name in names]
+    deadline = time.monotonic() + args.duration
+    client_ip = f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}"
+    while time.monotonic() < deadline:
+        script = SCRIPTS[rng.choices(names, weights)[0]][0](rng)
+        try:
+            async with Session(args.url, client_ip, args.timeout) as session:
+                for step, action in script:
+                    stats.record(step, await action(session))
+                    await asyncio.sleep(rng.uniform(0, 2 * args.think))
+                stats.rejections += session.alerts
+        except Exception as exc:
+            stats.error(exc)
+
+async def sample_rss(pid, stats, interval=0.25):
+    while True:
+        usage = process_usage(pid)
+        if usage:
+            stats.peak_rss_kib = max(stats.peak_rss_kib, usage[0])
+        await asyncio.sleep(interval)
+
+async def run_load(args, pid):
+    stats = Stats()
+    sampler = asyncio.create_task(sample_rss(pid, stats)) if pid else None
+    before = process_usage(pid) if pid else None
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        visitor(number, args, stats, random.Random(args.seed + number))
+        for number in range(args.sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    after = process_usage(pid) if pid else None
+    if sampler:
+        sampler.cancel()
+    return stats, elapsed, before, after
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# Start the app through boot.py with its writes in a scratch directory and
+# proxy headers trusted, so each simulated session counts as its own client
+def start_server(port):
+    env = dict(os.environ,
+               PORTFOLIO_DATA_DIR=tempfile.mkdtemp(prefix="portfolio-load-"),
+               PORTFOLIO_TRUST_PROXY_HEADERS="1")
+    server = subprocess.Popen(
+        [sys.executable, BOOT_FILE, "--server.headless", "true", "--server.port", str(port),
+         "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("the app exited during start-up")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("the app did not become healthy within 60s")
+
+def report(args, stats, elapsed, before, after):
+    all_latencies = [value for values in stats.latencies.values() for value in values]
+    print(f"{args.sessions} sessions for {elapsed:.1f}s: {len(all_latencies)} reruns, "
+          f"{len(all_latencies) / elapsed:.1f} reruns/s")
+    print(f"{'step':<10} {'count':>7} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'max_ms':>8}")
+    rows = sorted(stats.latencies.items()) + [("all", all_latencies)]
+    for step, values in rows:
+        print(f"{step:<10} {len(values):>7} {percentile(values, 0.5) * 1000:>8.1f} "
+              f"{percentile(values, 0.95) * 1000:>8.1f} {percentile(values, 0.99) * 1000:>8.1f} "
+              f"{max(values, default=0) * 1000:>8.1f}")
+    if stats.rejections:
+        print(f"rejected by admission control: {stats.rejections}")
+    if stats.errors:
+        print("errors:", ", ".join(f"{name} x{count}" for name, count in sorted(stats.errors.items())))
+    if before and after:
+        rss_growth = after[0] - before[0]
+        cpu = after[1] - before[1]
+        print(f"server RSS {before[0] / 1024:.1f} -> {after[0] / 1024:.1f} MiB "
+              f"(peak {stats.peak_rss_kib / 1024:.1f} MiB, {rss_growth / args.sessions:.0f} KiB/session)")
+        print(f"server CPU {cpu:.2f}s ({cpu / elapsed * 100:.0f}% of one core, "
+              f"{cpu / args.sessions * 1000:.0f} ms/session)")
+    return {
+        "sessions": args.sessions,
+        "seconds": round(elapsed, 2),
+        "reruns_per_second": round(len(all_latencies) / elapsed, 2),
+        "latency_ms": {
+            step: {f"p{q}": round(percentile(values, q / 100) * 1000, 2) for q in (50, 95, 99)}
+            for step, values in rows
+        },
+        "rejections": stats.rejections,
+        "errors": stats.errors,
+        "peak_rss_kib": stats.peak_rss_kib,
+        "cpu_seconds": round(after[1] - before[1], 2) if before and after else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the app with concurrent simulated websocket sessions")
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent sessions (default: 50)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds each session keeps visiting (default: 30)")
+    parser.add_argument("--ramp", type=float, default=5, help="seconds over which sessions start (default: 5)")
+    parser.add_argument("--think", type=float, default=1.0, help="mean pause between steps in seconds (default: 1.0)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for a rerun (default: 30)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="websocket URL of a running app; by default one is started locally")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    server = None
+    if args.url is None:
+        port = free_port()
+        server = start_server(port)
+        args.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    try:
+        stats, elapsed, before, after = asyncio.run(run_load(args, server.pid if server else None))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    results = report(args, stats, elapsed, before, after)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 1 if stats.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
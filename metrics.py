@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+import util
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket bounds in seconds, roughly doubling from 0.1 ms to 2.5 s
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+# Label values can come from content (question text, project ids), so they
+# are escaped as the Prometheus text format requires
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels) + "}"
+
+# In-process metrics: counters, timing histograms and gauges from collectors.
+#
+# Counters are always updated; only a `sample_rate` fraction of calls pay for
+# the two clock reads and the histogram update, which keeps a rerun's
+# instrumentation cost to a few microseconds. Histogram counts are therefore
+# a sample, while the *_total counters are exact.
+class Registry:
+    def __init__(self, sample_rate=0.1):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._server = None
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    # Count a call and, for sampled calls, time it into a histogram
+    @contextmanager
+    def timer(self, part):
+        self.count("portfolio_calls_total", part=part)
+        if random.random() >= self.sample_rate:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("portfolio_call_seconds", time.perf_counter() - start, part=part)
+
+    def timed(self, part):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(part):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # A collector returns (name, labels dict, value) gauges at scrape time,
+    # e.g. cache sizes owned by other modules
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (list(h.counts), h.total, h.count) for key, h in self._histograms.items()
+            }
+            collectors = list(self._collectors)
+        gauges = []
+        for collector in collectors:
+            try:
+                gauges.extend(collector())
+            except Exception:
+                logger.exception("metrics collector failed")
+        return counters, histograms, gauges
+
+    # Prometheus text exposition format
+    def render_prometheus(self):
+        counters, histograms, gauges = self.snapshot()
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            declare(name, "counter")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), (counts, total, count) in sorted(histograms.items()):
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += bucket
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+        for name, labels, value in gauges:
+            declare(name, "gauge")
+            lines.append(f"{name}{format_labels(tuple(sorted(labels.items())))} {value}")
+        return "\n".join(lines) + "\n"
+
+    # One structured log line: call counts, sampled mean timings and gauges
+    def log_summary(self):
+        counters, histograms, gauges = self.snapshot()
+        summary = {
+            "calls": {dict(labels).get("part", name): value for (name, labels), value in counters.items()},
+            "mean_ms": {
+                dict(labels)["part"]: round(total / count * 1000, 3)
+                for (name, labels), (_, total, count) in histograms.items() if count
+            },
+            "gauges": {name + format_labels(tuple(sorted(labels.items()))): value for name, labels, value in gauges},
+        }
+        logger.info("metrics %s", json.dumps(summary, sort_keys=True))
+
+    # Serve /metrics, and /ready for health checks, on a local port from a
+    # daemon thread. `ready` reports whether the app has finished warming
+    # up; a second call returns the server that is already running.
+    def serve(self, port, host="127.0.0.1", ready=None):
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class Handler(util.QuietHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    self.reply(200, registry.render_prometheus())
+                elif self.path == "/ready":
+                    if ready is None or ready():
+                        self.reply(200, "ready\n")
+                    else:
+                        self.reply(503, "warming up\n")
+                else:
+                    self.send_error(404)
+
+            def reply(self, status, text):
+                body = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = util.serve_http(Handler, host, port, "metrics-http")
+        return self._server
+
+    def log_every(self, interval):
+        def run():
+            while True:
+                time.sleep(interval)
+                self.log_summary()
+        threading.Thread(target=run, name="metrics-log", daemon=True).start()
+
+registry = Registry(sample_rate=float(os.environ.get("PORTFOLIO_METRICS_SAMPLE_RATE", "0.1")))
+timer = registry.timer
+timed = registry.timed
@@ -0,0 +1,154 @@
+import functools
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import assets
+import content
+import qa
+import resume
+import search
+import util
+
+logger = logging.getLogger(__name__)
+
+# content.json is the default portfolio; every other one is
+# profiles/<slug>.json in the same format, picked with ?profile=<slug>
+PROFILE_DIR = os.path.join(assets.BASE_DIR, "profiles")
+DEFAULT = "default"
+SLUG_RE = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+
+# The content file for a profile, or None if there is no such profile
+def profile_path(slug):
+    if slug == DEFAULT:
+        return content.CONTENT_FILE
+    if not SLUG_RE.fullmatch(slug):
+        return None
+    path = os.path.join(PROFILE_DIR, slug + ".json")
+    return path if os.path.isfile(path) else None
+
+def available():
+    slugs = [DEFAULT]
+    if os.path.isdir(PROFILE_DIR):
+        slugs += sorted(name[:-5] for name in os.listdir(PROFILE_DIR)
+                        if name.endswith(".json") and SLUG_RE.fullmatch(name[:-5]))
+    return slugs
+
+# One portfolio's content and the indexes built from it
+class Profile:
+    def __init__(self, slug, path, version, previous=None):
+        self.slug = slug
+        self.version = version
+        self.content = content.load(path)
+        qa_content = self.content["qa"]
+        self.fallback = qa_content["fallback"]
+        self.answers = qa.AnswerIndex(qa_content["answers"])
+        # A reloaded profile keeps its search index and re-indexes only the
+        # documents that changed
+        self.search = previous.search if previous is not None else search.SearchIndex()
+        self.search_changes = self.search.update(search.documents(self.content), version)
+        self.size = util.footprint(self)
+
+    # Answer cache namespace: answers from an older version of the content
+    # are never served and simply age out of the cache
+    @property
+    def cache_namespace(self):
+        return (self.slug, self.version)
+
+    # Key of this profile's resume PDF; see resume.ResumeBuilder
+    @functools.cached_property
+    def resume_digest(self):
+        return resume.digest(self.content)
+
+# Loaded profiles, least recently used evicted first once their combined
+# footprint passes `max_bytes`. The profile just loaded is always kept, even
+# if it alone is over budget.
+#
+# Profiles are reloaded when their file changes. Each slug has its own build
+# lock, so concurrent first visits to a profile load it once, while hits on
+# other profiles never wait for a load.
+#
+# A reload that fails (invalid JSON, a schema error, a file caught mid-save)
+# is logged and the last good version keeps being served; a profile that has
+# never loaded is treated as missing. The failed version is remembered, so
+# the file is not parsed again until it changes.
+class ProfileCache:
+    def __init__(self, max_bytes, on_load=None):
+        self.max_bytes = max_bytes
+        self.on_load = on_load
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._building = {}
+        self._failed = {}  # slug -> file version that failed to load
+        self.failures = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, slug, version):
+        with self._lock:
+            profile = self._entries.get(slug)
+            if profile is not None and profile.version == version:
+                self._entries.move_to_end(slug)
+                self.hits += 1
+                return profile, None
+            return None, profile
+
+    # The profile for `slug`, loading it if needed; None if there is none
+    # or it has never loaded
+    def get(self, slug):
+        path = profile_path(slug)
+        if path is None:
+            return None
+        try:
+            version = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        profile, previous = self._lookup(slug, version)
+        if profile is not None:
+            return profile
+        if self._failed.get(slug) == version:
+            return previous
+
+        with self._lock:
+            building = self._building.setdefault(slug, threading.Lock())
+        with building:
+            profile, previous = self._lookup(slug, version)
+            if profile is not None:
+                return profile
+            if self._failed.get(slug) == version:
+                return previous
+            try:
+                profile = Profile(slug, path, version, previous)
+            except (content.ContentError, OSError) as exc:
+                logger.error("profile %s failed to load, %s: %s", slug,
+                             "still serving the previous version" if previous else "not serving it", exc)
+                with self._lock:
+                    self._failed[slug] = version
+                    self.failures += 1
+                    self._building.pop(slug, None)
+                return previous
+            if self.on_load is not None:
+                self.on_load(profile)
+            with self._lock:
+                self._failed.pop(slug, None)
+                self.misses += 1
+                old = self._entries.pop(slug, None)
+                if old is not None:
+                    self._bytes -= old.size
+                self._entries[slug] = profile
+                self._bytes += profile.size
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.size
+                    self.evictions += 1
+                self._building.pop(slug, None)
+            return profile
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "failures": self.failures}
@@ -0,0 +1,255 @@
+import asyncio
+import math
+import re
+import string
+import threading
+import time
+from collections import OrderedDict
+
+STOPWORDS = frozenset("""
+a about an and are as at be between by can could did do does for from had has
+have how i in is it its me my of on or so tell than that the their them there
+these they this to was what when where which who why will with would you your
+""".split())
+
+# Words that frame a question rather than say what it is about ("what do you
+# know about", "how would you explain"). They are left out of Q&A scoring so
+# an off-topic question cannot match a canned one on its wording alone.
+QUESTION_WORDS = frozenset("""
+describe difference explain experience interest know knowledge opinion think
+understand understanding use used using view
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*[+#]*")
+CONTRACTION_RE = re.compile(r"['’][a-z]*")
+
+PUNCTUATION = str.maketrans("", "", string.punctuation + "’‘“”")
+
+# Field boosts: the canonical question and its key phrase count for more than
+# words that only appear somewhere in the answer body
+QUESTION_BOOST = 2
+MATCH_BOOST = 3
+
+# Light normalisation so "transformers" finds "transformer"
+def stem(token):
+    if len(token) > 4 and token.isalpha() and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+def tokenize(text):
+    text = CONTRACTION_RE.sub("", text.lower())
+    return [stem(t) for t in TOKEN_RE.findall(text) if t not in STOPWORDS]
+
+def question_terms(text):
+    return [t for t in tokenize(text) if t not in QUESTION_WORDS]
+
+# BM25 parameters shared by the Q&A index and site search, so the two rank
+# the same way: k1 is how quickly repeats of a term stop adding to the score,
+# b how strongly long documents are penalised
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def bm25_idf(n_docs, doc_freq):
+    return math.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+# Score contribution of one term occurring `tf` times in a document
+def bm25_weight(tf, idf, length, avg_length, k1=BM25_K1, b=BM25_B):
+    norm = k1 * (1 - b + b * length / avg_length)
+    return idf * tf * (k1 + 1) / (tf + norm)
+
+# BM25 inverted index over the Q&A answer bank.
+#
+# Postings are stored CSR-style: the documents containing term t are
+# doc_ids[indptr[t]:indptr[t + 1]] with precomputed BM25 weights alongside, so
+# a query only touches the postings of its own terms and its cost does not
+# grow with the number of answers.
+class AnswerIndex:
+    def __init__(self, entries, k1=BM25_K1, b=BM25_B):
+        # numpy is imported here rather than at module level: it is the
+        # slowest import in the app and only the Q&A index needs it
+        import numpy as np
+        self.entries = list(entries)
+        docs = []
+        for entry in self.entries:
+            tokens = question_terms(entry["answer"])
+            tokens += question_terms(entry["question"]) * QUESTION_BOOST
+            tokens += question_terms(entry["match"]) * MATCH_BOOST
+            docs.append(tokens)
+
+        lengths = np.array([len(d) for d in docs], dtype=np.float64)
+        avg_length = lengths.mean() if len(docs) else 0.0
+
+        postings = {}
+        for doc_id, tokens in enumerate(docs):
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+
+        self.vocabulary = {}
+        indptr = [0]
+        doc_ids = []
+        weights = []
+        n_docs = len(docs)
+        for term_id, (token, plist) in enumerate(sorted(postings.items())):
+            self.vocabulary[token] = term_id
+            idf = bm25_idf(n_docs, len(plist))
+            for doc_id, tf in plist:
+                doc_ids.append(doc_id)
+                weights.append(bm25_weight(tf, idf, lengths[doc_id], avg_length, k1, b))
+            indptr.append(len(doc_ids))
+
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.doc_ids = np.array(doc_ids, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+
+    # Top-k (entry, score, coverage) triples for a free-text question, best
+    # first. Coverage is the fraction of the question's terms, known to the
+    # index or not, that appear in the entry.
+    def rank(self, question, k=3):
+        import numpy as np
+        terms = set(question_terms(question))
+        term_ids = {self.vocabulary[t] for t in terms if t in self.vocabulary}
+        if not term_ids:
+            return []
+
+        spans = [slice(self.indptr[t], self.indptr[t + 1]) for t in term_ids]
+        hit_docs = np.concatenate([self.doc_ids[s] for s in spans])
+        hit_weights = np.concatenate([self.weights[s] for s in spans])
+
+        # Accumulate scores over the candidate documents only; a term has at
+        # most one posting per document, so the plain counts are the number
+        # of question terms each candidate contains
+        candidates, inverse = np.unique(hit_docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=hit_weights)
+        matched = np.bincount(inverse)
+
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.entries[candidates[i]], float(scores[i]), int(matched[i]) / len(terms)) for i in top]
+
+    # Top-k (entry, score) pairs for a free-text question, best first
+    def search(self, question, k=3):
+        return [(entry, score) for entry, score, _ in self.rank(question, k)]
+
+    # Best answer for the question, or the fallback when nothing scores well.
+    # The best entry must also cover at least `min_coverage` of the question,
+    # so one shared word in a longer question is not enough.
+    def answer(self, question, fallback, min_score=1.0, min_coverage=0.6):
+        hits = self.rank(question, k=1)
+        if hits and hits[0][1] >= min_score and hits[0][2] >= min_coverage:
+            return hits[0][0]["answer"]
+        return fallback
+
+# Cache key for a question: case-folded, punctuation stripped and whitespace
+# collapsed, so "What is RAG?" and "what is rag" share an entry
+def normalize_question(question):
+    return " ".join(question.casefold().translate(PUNCTUATION).split())
+
+# Process-wide LRU cache of answers with a per-entry time to live.
+#
+# Shared by every session; all access goes through one lock, which is held
+# only for dictionary operations and never while an answer is computed.
+class AnswerCache:
+    def __init__(self, max_entries=1024, ttl=3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # `namespace` keeps answers from different answer banks apart
+    def get(self, question, namespace=None):
+        key = (namespace, normalize_question(question))
+        now = self.clock()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, question, value, namespace=None):
+        key = (namespace, normalize_question(question))
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, question, compute, namespace=None):
+        value = self.get(question, namespace)
+        if value is None:
+            value = compute(question)
+            self.put(question, value, namespace)
+        return value
+
+    # Invalidation hook: drop every answer, e.g. after the answer bank changed
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# Split an answer into chunks of about chunk_size characters, breaking on
+# whitespace so words are never cut in half
+def chunk_text(text, chunk_size=24):
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space + 1
+        yield text[start:end]
+        start = end
+
+# Drive a sync or async iterable of chunks from synchronous code
+def iterate_chunks(chunks):
+    if not hasattr(chunks, "__aiter__"):
+        yield from chunks
+        return
+    loop = asyncio.new_event_loop()
+    iterator = chunks.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.close()
+
+# Default answer backend: retrieval over the local answer bank. A backend is
+# any callable that takes a question and returns a (sync or async) iterable
+# of text chunks, so a slower generator such as a remote model can be
+# swapped in without touching the renderer.
+class RetrievalBackend:
+    def __init__(self, index, fallback, chunk_size=24):
+        self.index = index
+        self.fallback = fallback
+        self.chunk_size = chunk_size
+
+    def __call__(self, question):
+        return chunk_text(self.index.answer(question, self.fallback), self.chunk_size)
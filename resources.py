@@ -0,0 +1,241 @@
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+import admission
+import analytics
+import api
+import assets
+import components
+import content
+import conversation
+import images
+import metrics
+import profiles
+import qa
+import resume
+import sessions
+import submissions
+
+logger = logging.getLogger(__name__)
+
+# Process-wide resources shared by every session. They live in an imported
+# module rather than in proof.py so the cache keys are the same whether they
+# are first built by a page run or by warm_up() at server boot.
+
+# Process-wide answer cache shared by all sessions and profiles
+@st.cache_resource
+def get_answer_cache():
+    return qa.AnswerCache(max_entries=1024, ttl=3600)
+
+# Portfolios by slug (see profiles.py), each parsed, validated and indexed on
+# first visit and again when its file changes on disk. Loaded profiles are
+# kept while they fit in PORTFOLIO_PROFILE_CACHE_MB; a (re)load answers the
+# preset questions up front.
+@st.cache_resource
+def get_profiles():
+    cache = get_answer_cache()
+
+    def answer_presets(profile):
+        for entry in profile.content["qa"]["answers"]:
+            cache.put(entry["question"], profile.answers.answer(entry["question"], profile.fallback),
+                      profile.cache_namespace)
+        added, changed, removed = profile.search_changes
+        logger.info("profile %s loaded (%d KiB); search index: %d added, %d changed, %d removed",
+                    profile.slug, profile.size // 1024, added, changed, removed)
+
+    budget = int(os.environ.get("PORTFOLIO_PROFILE_CACHE_MB", 64)) << 20
+    return profiles.ProfileCache(budget, on_load=answer_presets)
+
+# None for an unknown slug
+def get_profile(slug=profiles.DEFAULT):
+    return get_profiles().get(slug)
+
+def get_content(slug=profiles.DEFAULT):
+    return get_profile(slug).content
+
+# Minified stylesheet, rebuilt only when static/style.css changes on disk
+@st.cache_resource(max_entries=1)
+def load_stylesheet(mtime):
+    return assets.build_stylesheet(assets.STYLESHEET)
+
+def get_stylesheet():
+    return load_stylesheet(os.stat(assets.STYLESHEET).st_mtime_ns)
+
+# Responsive variants of one screenshot. Resizing happens once per source
+# image (the variants are cached on disk by content hash); this in-memory
+# layer saves re-reading the manifest on every rerun.
+@st.cache_resource(max_entries=64)
+def load_screenshot(path, mtime):
+    return images.build_variants(path)
+
+# Screenshot manifests by project id
+def get_screenshots(slug=profiles.DEFAULT):
+    profile = get_profile(slug)
+    screenshots = {}
+    for project in profile.content["projects"] if profile is not None else ():
+        if "screenshot" in project:
+            path = content.screenshot_path(project["screenshot"])
+            screenshots[project["id"]] = load_screenshot(path, os.stat(path).st_mtime_ns)
+    return screenshots
+
+# Background writer for contact form messages, one per process
+@st.cache_resource
+def get_submission_writer():
+    return submissions.SubmissionWriter()
+
+# Q&A history kept per session, and saved to disk when
+# PORTFOLIO_PERSIST_CONVERSATIONS=1 so it survives a reload; None when not
+# saved
+CONVERSATION_CAPACITY = 20
+
+@st.cache_resource
+def get_conversation_store():
+    if os.environ.get("PORTFOLIO_PERSIST_CONVERSATIONS") != "1":
+        return None
+    return conversation.ConversationStore(capacity=CONVERSATION_CAPACITY)
+
+# Visitor analytics, flushed to data/analytics.db every
+# PORTFOLIO_ANALYTICS_FLUSH_INTERVAL seconds
+@st.cache_resource
+def get_tracker():
+    interval = float(os.environ.get("PORTFOLIO_ANALYTICS_FLUSH_INTERVAL", 30))
+    return analytics.Tracker(analytics.EventWriter(), flush_interval=interval)
+
+# Resume PDFs, built on a background thread and cached in data/resumes
+@st.cache_resource
+def get_resume_builder():
+    return resume.ResumeBuilder()
+
+# Closes sessions idle for PORTFOLIO_SESSION_IDLE_TIMEOUT seconds or holding
+# more than PORTFOLIO_SESSION_MAX_KB, checked every
+# PORTFOLIO_SESSION_SWEEP_INTERVAL seconds
+@st.cache_resource
+def get_session_reaper():
+    return sessions.SessionReaper(
+        idle_timeout=float(os.environ.get("PORTFOLIO_SESSION_IDLE_TIMEOUT", 1800)),
+        max_bytes=int(os.environ.get("PORTFOLIO_SESSION_MAX_KB", 1024)) << 10,
+        interval=float(os.environ.get("PORTFOLIO_SESSION_SWEEP_INTERVAL", 60)),
+    )
+
+# Rate limits (requests per second, burst) and duplicate windows (seconds)
+# for the Ask button and the contact form. Callers put the session (ask) or
+# client address (contact) in the payload, so a common message sent by one
+# visitor does not block everyone else.
+@st.cache_resource
+def get_admission():
+    return {
+        "ask": admission.Admission(
+            session_rate=0.5, session_burst=5,
+            client_rate=2.0, client_burst=20,
+            duplicate_window=10,
+        ),
+        "contact": admission.Admission(
+            session_rate=1 / 60, session_burst=3,
+            client_rate=0.1, client_burst=10,
+            duplicate_window=3600,
+        ),
+    }
+
+# Cache, queue and admission figures reported with each metrics scrape. The
+# objects are looked up once here, as the scrape runs outside any session.
+def cache_gauges(answer_cache, profile_cache, writer, gates):
+    def collect():
+        gauges = []
+        for cache, stats in (("answers", answer_cache.stats()), ("profiles", profile_cache.stats()),
+                             ("fragments", components.fragments.stats())):
+            for key, value in stats.items():
+                gauges.append((f"portfolio_cache_{key}", {"cache": cache}, value))
+        gauges.append(("portfolio_submissions_pending", {}, writer.pending()))
+        gauges.append(("portfolio_submissions_written", {}, writer.written))
+        gauges.append(("portfolio_submissions_rejected", {}, writer.rejected))
+        gauges.append(("portfolio_submissions_dropped", {}, writer.dropped))
+        for action, gate in gates.items():
+            stats = gate.stats()
+            gauges.append(("portfolio_admitted", {"action": action}, stats["admitted"]))
+            for reason, value in stats["rejected"].items():
+                gauges.append(("portfolio_rejected", {"action": action, "reason": reason}, value))
+        return gauges
+    return collect
+
+# Event totals from the analytics rollups, as of their last flush
+def event_counters(tracker):
+    def collect():
+        gauges = [("portfolio_events", {"event": event, "value": value}, count)
+                  for (event, value), count in sorted(tracker.totals().items())]
+        gauges.append(("portfolio_events_dropped", {}, tracker.dropped))
+        return gauges
+    return collect
+
+# Session memory and eviction figures, as of the last sweep
+def session_gauges(reaper):
+    def collect():
+        gauges = [("portfolio_active_sessions", {}, reaper.active())]
+        gauges += [(f"portfolio_session_{key}", {}, value) for key, value in reaper.stats().items()]
+        return gauges
+    return collect
+
+# Metrics are collected in-process; PORTFOLIO_METRICS_PORT serves them in
+# Prometheus text format on localhost and PORTFOLIO_METRICS_LOG_INTERVAL logs
+# a summary line every so many seconds
+@st.cache_resource
+def start_metrics():
+    registry = metrics.registry
+    registry.add_collector(cache_gauges(get_answer_cache(), get_profiles(), get_submission_writer(), get_admission()))
+    registry.add_collector(event_counters(get_tracker()))
+    registry.add_collector(session_gauges(get_session_reaper()))
+    port = os.environ.get("PORTFOLIO_METRICS_PORT")
+    if port:
+        try:
+            registry.serve(int(port), ready=ready.is_set)
+        except OSError:
+            metrics.logger.warning("metrics port %s unavailable", port)
+    interval = os.environ.get("PORTFOLIO_METRICS_LOG_INTERVAL")
+    if interval:
+        registry.log_every(float(interval))
+    return registry
+
+# The read-only JSON content API (see api.py), served on
+# PORTFOLIO_API_PORT when it is set, on PORTFOLIO_API_HOST (localhost by
+# default; put it behind the same proxy as the app). It reads profiles from
+# the same cache as the pages.
+@st.cache_resource
+def start_api():
+    content_api = api.ContentAPI(get_profiles())
+    port = os.environ.get("PORTFOLIO_API_PORT")
+    if port:
+        try:
+            content_api.serve(int(port), host=os.environ.get("PORTFOLIO_API_HOST", "127.0.0.1"))
+        except OSError:
+            logger.warning("API port %s unavailable", port)
+    return content_api
+
+# Set once warm_up() has finished; /ready on the metrics port reports it
+ready = threading.Event()
+
+# Build everything a first page view would otherwise build, step by step,
+# and return the seconds each step took
+def warm_up():
+    timings = {}
+    for name, step in (
+        ("metrics", start_metrics),
+        ("content api", start_api),
+        ("default profile", get_profile),
+        ("stylesheet", get_stylesheet),
+        ("screenshots", get_screenshots),
+        ("submission writer", get_submission_writer),
+        ("conversation store", get_conversation_store),
+        ("analytics", get_tracker),
+        ("session reaper", get_session_reaper),
+        ("admission", get_admission),
+    ):
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    ready.set()
+    logger.info("warm-up finished in %.1f ms: %s", sum(timings.values()) * 1000,
+                ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in timings.items()))
+    return timings
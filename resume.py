@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import assets
+import util
+
+logger = logging.getLogger(__name__)
+
+RESUME_DIR = os.path.join(assets.DATA_DIR, "resumes")
+# Content the resume is built from; nothing else affects the PDF
+FIELDS = ("profile", "education", "experience", "achievements", "certifications", "skills", "projects")
+# Bump when the layout changes, so resumes already on disk are rebuilt
+LAYOUT_VERSION = 1
+
+# Character widths in 1/1000 em for printable ASCII (32-126) in the two base
+# fonts every PDF reader has, used for line breaking. Other characters are
+# measured as DEFAULT_WIDTH, a little wide for most punctuation.
+HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+DEFAULT_WIDTH = 556
+FONTS = {False: ("F1", HELVETICA), True: ("F2", HELVETICA_BOLD)}
+
+# Text in the base fonts' WinAnsi encoding; characters it lacks become "?"
+def encode(text):
+    return text.encode("cp1252", "replace")
+
+def text_width(text, size, bold=False):
+    widths = FONTS[bold][1]
+    total = sum(widths[b - 32] if 32 <= b <= 126 else DEFAULT_WIDTH for b in encode(text))
+    return total * size / 1000
+
+def pdf_string(text):
+    escaped = encode(text).replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + escaped + b")"
+
+# A minimal PDF writer: pages of left-aligned, word-wrapped text in Helvetica
+# and rules, flowing onto a new page at the bottom margin. Output depends
+# only on what is drawn, so the same content always gives the same bytes.
+class PDF:
+    def __init__(self, title="", width=612, height=792, margin=54):
+        self.title = title
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.pages = []
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.pages.append([])
+        self.y = self.height - self.margin
+
+    def space(self, points):
+        self.y -= points
+
+    def _reserve(self, height):
+        if self.y - height < self.margin:
+            self.new_page()
+        self.y -= height
+
+    def _text(self, x, text, size, bold):
+        font = FONTS[bold][0].encode("ascii")
+        self.pages[-1].append(b"BT /%s %g Tf %.2f %.2f Td %s Tj ET" % (font, size, x, self.y, pdf_string(text)))
+
+    # Word-wrapped text; `label` is set in bold at the start of the first
+    # line and `bullet` hangs in the indent
+    def paragraph(self, text, size=10, bold=False, indent=0, label=None, bullet=None, leading=1.3):
+        left = self.margin + indent
+        width = self.width - self.margin - left
+        line = []
+        offset = text_width(label + " ", size, True) if label else 0
+        lines = []
+        for word in text.split():
+            candidate = " ".join(line + [word])
+            if line and offset + text_width(candidate, size, bold) > width:
+                lines.append((offset, " ".join(line)))
+                line, offset = [word], 0
+            else:
+                line.append(word)
+        lines.append((offset, " ".join(line)))
+
+        for i, (offset, words) in enumerate(lines):
+            self._reserve(size * leading)
+            if i == 0 and label:
+                self._text(left, label, size, True)
+            if i == 0 and bullet:
+                self._text(left - text_width(bullet + " ", size), bullet, size, False)
+            self._text(left + offset, words, size, bold)
+
+    # A bold left-hand title with smaller text flush right on the same line,
+    # or on the next line when both do not fit
+    def row(self, left, right, size=10.5, leading=1.35):
+        right_size = size - 1
+        right_width = text_width(right, right_size)
+        if text_width(left, size, True) + right_width + 12 > self.width - 2 * self.margin:
+            self.paragraph(left, size, bold=True, leading=leading)
+            self.paragraph(right, right_size)
+            return
+        self._reserve(size * leading)
+        self._text(self.margin, left, size, True)
+        self._text(self.width - self.margin - right_width, right, right_size, False)
+
+    def rule(self, gap=3):
+        self.space(gap)
+        self.pages[-1].append(b"0.6 w %.2f %.2f m %.2f %.2f l S" % (self.margin, self.y, self.width - self.margin, self.y))
+        self.space(gap * 2)
+
+    def render(self):
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(None)
+        pages = add(None)
+        regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        info = add(b"<< /Title %s >>" % pdf_string(self.title))
+        kids = []
+        for operations in self.pages:
+            stream = zlib.compress(b"\n".join(operations), 9)
+            contents = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+            kids.append(add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+                b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> >>"
+                % (pages, self.width, self.height, contents, regular, bold)
+            ))
+        objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages
+        objects[pages - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1, catalog, info, xref)
+        return bytes(out)
+
+def section(pdf, title):
+    pdf.space(8)
+    pdf.paragraph(title.upper(), size=11, bold=True)
+    pdf.rule()
+
+# The resume as PDF bytes, from the same content the Home and Projects pages show
+def build(data):
+    profile = data["profile"]
+    pdf = PDF(title=f"{profile['name']} - Resume")
+    pdf.paragraph(profile["name"], size=20, bold=True)
+    pdf.paragraph(profile["title"], size=11)
+    links = [profile["linkedin"], profile["github"]]
+    contact = [profile["email"], profile["phone"], profile["location"]] + [url.split("://", 1)[-1] for url in links]
+    pdf.paragraph(" | ".join(contact), size=9)
+
+    section(pdf, "Summary")
+    pdf.paragraph(profile["summary"])
+
+    section(pdf, "Education")
+    for school in data["education"]:
+        pdf.row(school["institution"], school["period"])
+        details = [school.get("degree", ""), *school["results"]]
+        pdf.paragraph(", ".join(d for d in details if d))
+        if school.get("coursework"):
+            pdf.paragraph(school["coursework"], size=9, label="Coursework:")
+        pdf.space(4)
+
+    section(pdf, "Experience")
+    for job in data["experience"]:
+        pdf.row(f"{job['role']}, {job['company']}", f"{job['period']} | {job['location']}")
+        for highlight in job["highlights"]:
+            pdf.paragraph(util.plain(highlight), indent=12, bullet="•")
+        pdf.space(4)
+
+    section(pdf, "Projects")
+    for project in data["projects"]:
+        pdf.row(project["title"], ", ".join(project["tech_stack"]))
+        pdf.paragraph(util.plain(project["summary"]))
+        for highlight in project["highlights"]:
+            pdf.paragraph(util.plain(highlight), indent=12, bullet="•")
+        pdf.space(4)
+
+    section(pdf, "Skills")
+    for category in data["skills"]["categories"]:
+        pdf.paragraph(", ".join(category["skills"]), label=category["name"] + ":")
+
+    section(pdf, "Leadership & Achievements")
+    for item in data["achievements"]:
+        pdf.paragraph(item["title"], bold=True)
+        pdf.paragraph(util.plain(item["description"]))
+        pdf.space(3)
+
+    section(pdf, "Certifications")
+    for certification in data["certifications"]:
+        pdf.paragraph(certification, indent=12, bullet="•")
+    return pdf.render()
+
+# Hash of the content and layout the resume is built from
+def digest(data):
+    payload = json.dumps([LAYOUT_VERSION] + [data[field] for field in FIELDS], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def file_name(data):
+    return re.sub(r"[^A-Za-z0-9]+", "-", data["profile"]["name"]).strip("-") + "-Resume.pdf"
+
+# Builds resumes on a background worker and keeps them on disk by content
+# hash, named resume-<hash>.pdf.
+#
+# request() returns a future for the PDF's path: already resolved when the
+# file exists, otherwise the future of the one build in flight for that
+# hash, so any number of concurrent requests for the same content cost a
+# single render.
+class ResumeBuilder:
+    def __init__(self, out_dir=RESUME_DIR, workers=1):
+        self.out_dir = out_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume")
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.built = 0
+        self.coalesced = 0
+
+    def path(self, digest):
+        return os.path.join(self.out_dir, f"resume-{digest}.pdf")
+
+    def request(self, data, digest):
+        path = self.path(digest)
+        if os.path.exists(path):
+            future = Future()
+            future.set_result(path)
+            return future
+        with self._lock:
+            future = self._pending.get(digest)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._executor.submit(self._build, data, path)
+            self._pending[digest] = future
+        future.add_done_callback(lambda _: self._forget(digest))
+        return future
+
+    def _forget(self, digest):
+        with self._lock:
+            self._pending.pop(digest, None)
+
+    def _build(self, data, path):
+        try:
+            pdf = build(data)
+            os.makedirs(self.out_dir, exist_ok=True)
+            util.write_atomic(path, lambda f: f.write(pdf))
+        except Exception:
+            logger.exception("building %s failed", path)
+            raise
+        self.built += 1
+        logger.info("built %s (%d bytes)", path, len(pdf))
+        return path
@@ -0,0 +1,190 @@
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+import qa
+import util
+
+# A searchable piece of the portfolio and the section that shows it
+Document = namedtuple("Document", "id section title text")
+Hit = namedtuple("Hit", "document score terms")
+
+TITLE_BOOST = 2
+# Everything a visitor can read, one document per card, entry or answer
+def documents(data):
+    profile = data["profile"]
+    yield Document("profile", "Home", "About Me", f"{profile['title']}. {profile['summary']}")
+    for i, school in enumerate(data["education"]):
+        text = " ".join([school.get("degree", ""), school.get("coursework", ""), school["period"], *school["results"]])
+        yield Document(f"education:{i}", "Home", school["institution"], text)
+    for i, job in enumerate(data["experience"]):
+        text = " ".join([job["period"], job["location"], *job["highlights"]])
+        yield Document(f"experience:{i}", "Home", f"{job['role']}, {job['company']}", text)
+    for i, item in enumerate(data["achievements"]):
+        yield Document(f"achievement:{i}", "Home", item["title"], item["description"])
+    yield Document("certifications", "Home", "Certifications", " ".join(data["certifications"]))
+
+    for category in data["skills"]["categories"]:
+        text = ", ".join(category["skills"]) + ". " + " ".join(util.plain(d) for d in category["details"])
+        yield Document(f"skills:{category['name']}", "Skills", category["name"], text)
+
+    for project in data["projects"]:
+        parts = [", ".join(project["tech_stack"]), project["summary"], *project["highlights"]]
+        for section in project["details"]:
+            parts.append(section["heading"])
+            parts.extend(section["items"])
+        yield Document(f"project:{project['id']}", "Projects", project["title"], " ".join(util.plain(p) for p in parts))
+
+    ai = data["ai"]
+    text = " ".join(f"{item['label']}: {item['text']}" for item in ai["skills"])
+    yield Document("ai:skills", "AI Experience", "AI/ML Skills & Knowledge", text)
+    yield Document("ai:interests", "AI Experience", "Areas of Interest", " ".join(ai["interests"]))
+    for i, project in enumerate(ai["projects"]):
+        text = " ".join([project["summary"], *project["highlights"]])
+        yield Document(f"ai:project:{i}", "AI Experience", project["title"], text)
+    for i, entry in enumerate(data["qa"]["answers"]):
+        yield Document(f"qa:{i}", "AI Experience", entry["question"], entry["answer"])
+
+    yield Document("availability", "Contact", "Availability", " ".join(data["contact"]["availability"]))
+
+def fingerprint(document):
+    return hashlib.blake2b(f"{document.section}\0{document.title}\0{document.text}".encode("utf-8"),
+                           digest_size=8).digest()
+
+# BM25 inverted index over the portfolio that can be updated in place.
+#
+# Postings are term -> {doc id: term frequency}, so replacing one document
+# touches only its own terms. update() diffs the new documents against the
+# indexed ones by fingerprint and re-indexes only what was added, changed or
+# removed; a content edit that fixes one typo re-tokenizes one document.
+class SearchIndex:
+    def __init__(self, k1=qa.BM25_K1, b=qa.BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.version = None
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._fingerprints = {}
+        self._lengths = {}
+        self._total_length = 0
+        self._postings = {}
+        self._terms = None  # sorted vocabulary for prefix matches, built lazily
+
+    def _add(self, document):
+        tokens = qa.tokenize(document.text) + qa.tokenize(document.title) * TITLE_BOOST
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self._postings.setdefault(token, {})[document.id] = tf
+        self._documents[document.id] = document
+        self._fingerprints[document.id] = fingerprint(document)
+        self._lengths[document.id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def _remove(self, doc_id):
+        document = self._documents.pop(doc_id)
+        del self._fingerprints[doc_id]
+        self._total_length -= self._lengths.pop(doc_id)
+        for token in set(qa.tokenize(document.text) + qa.tokenize(document.title)):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    # Bring the index in line with `documents`; returns (added, changed, removed)
+    def update(self, documents, version=None):
+        documents = {document.id: document for document in documents}
+        with self._lock:
+            removed = [doc_id for doc_id in self._documents if doc_id not in documents]
+            changed = [
+                doc_id for doc_id, document in documents.items()
+                if doc_id in self._documents and self._fingerprints[doc_id] != fingerprint(document)
+            ]
+            added = [doc_id for doc_id in documents if doc_id not in self._documents]
+            for doc_id in removed + changed:
+                self._remove(doc_id)
+            for doc_id in changed + added:
+                self._add(documents[doc_id])
+            if removed or changed or added:
+                self._terms = None
+            self.version = version
+        return len(added), len(changed), len(removed)
+
+    def __len__(self):
+        return len(self._documents)
+
+    # Query terms; a last term that is not in the index is read as a prefix
+    # ("postg" finds "postgresql") so results appear while typing
+    def _expand(self, query):
+        tokens = qa.tokenize(query)
+        if not tokens or tokens[-1] in self._postings:
+            return tokens
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        prefix = tokens[-1]
+        start = bisect_left(self._terms, prefix)
+        completions = []
+        for term in self._terms[start:start + 20]:
+            if not term.startswith(prefix):
+                break
+            completions.append(term)
+        return tokens[:-1] + completions
+
+    # Best documents first: those matching more of the query's words, then
+    # by BM25 score
+    def search(self, query, k=5):
+        with self._lock:
+            terms = [t for t in self._expand(query) if t in self._postings]
+            if not terms:
+                return []
+            n_docs = len(self._documents)
+            avg_length = self._total_length / n_docs
+            scores = {}
+            matched = {}
+            for term in set(terms):
+                postings = self._postings[term]
+                idf = qa.bm25_idf(n_docs, len(postings))
+                for doc_id, tf in postings.items():
+                    weight = qa.bm25_weight(tf, idf, self._lengths[doc_id], avg_length, self.k1, self.b)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight
+                    matched.setdefault(doc_id, set()).add(term)
+            ranked = sorted(scores, key=lambda doc_id: (len(matched[doc_id]), scores[doc_id]), reverse=True)
+            return [Hit(self._documents[d], scores[d], frozenset(matched[d])) for d in ranked[:k]]
+
+# A window of `text` around the first matched term, as (text, highlighted)
+# pieces; `terms` are index terms, so words are matched the way they were
+# tokenized
+def snippet(text, terms, width=140):
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters change length when lowercased; offsets must line up
+        lowered = text
+    lowered = qa.CONTRACTION_RE.sub(lambda m: " " * len(m.group()), lowered)
+    spans = [m.span() for m in qa.TOKEN_RE.finditer(lowered) if qa.stem(m.group()) in terms]
+    if not spans:
+        return [(text[:width] + ("…" if len(text) > width else ""), False)]
+
+    start = max(0, spans[0][0] - width // 4)
+    if start:
+        start = text.find(" ", start, spans[0][0]) + 1 or start
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", spans[0][1], end)
+        if space > 0:
+            end = space
+
+    pieces = [("…", False)] if start else []
+    position = start
+    for span_start, span_end in spans:
+        if span_start < start or span_end > end:
+            continue
+        pieces.append((text[position:span_start], False))
+        pieces.append((text[span_start:span_end], True))
+        position = span_end
+    pieces.append((text[position:end], False))
+    if end < len(text):
+        pieces.append(("…", False))
+    return [piece for piece in pieces if piece[0]]
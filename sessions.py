@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+import time
+
+import util
+
+logger = logging.getLogger(__name__)
+
+# Streamlit has no public API for listing live sessions or closing one from
+# another thread. Everything that reaches into the runtime is in the
+# functions below, so a Streamlit upgrade that moves things turns the reaper into a
+# no-op (with a warning) rather than breaking pages.
+
+# Streamlit's id for the session running this page, if any
+def current_session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+# (session id, AppSession) for every session with a connected browser
+def live_sessions():
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return []
+    manager = runtime.get_instance()._session_mgr
+    return [(info.session.id, info.session) for info in manager.list_active_sessions()]
+
+# Shut a session down and drop its state. Its websocket is closed as "going
+# away", so an open tab reconnects to a fresh session (the URL keeps the
+# section and profile, a cookie the saved conversation) instead of talking to
+# a session that is gone.
+def close_session(session_id):
+    from streamlit import runtime
+
+    instance = runtime.get_instance()
+
+    def close():
+        client = instance.get_client(session_id)
+        instance.close_session(session_id)
+        websocket = getattr(client, "_websocket", None)
+        if websocket is not None:
+            asyncio.ensure_future(websocket.close(code=1001))
+
+    instance._get_async_objs().eventloop.call_soon_threadsafe(close)
+
+# Memory accounting and eviction for visitor sessions.
+#
+# Pages call touch() whenever a session runs, full page or fragment; this
+# is the app's one record of session activity, and active() counts the
+# sessions seen in the last `active_window` seconds for metrics. Every
+# `interval` seconds a background sweep estimates each live session's
+# footprint (its session state: widget values and metadata, conversation
+# history and so on) and closes sessions that have been idle longer than
+# `idle_timeout` or hold more than `max_bytes`. Each sweep logs what it
+# reclaimed; the figures are also exported as metrics.
+class SessionReaper:
+    def __init__(self, idle_timeout=1800.0, max_bytes=1 << 20, interval=60.0, active_window=300.0):
+        self.idle_timeout = idle_timeout
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.active_window = active_window
+        self._last_seen = {}
+        self._lock = threading.Lock()
+        self.sizes = {}  # session id -> bytes, as of the last sweep
+        self.reaped = {"idle": 0, "over_cap": 0}
+        self.reclaimed_bytes = 0
+        self._thread = threading.Thread(target=self._run, name="session-reaper", daemon=True)
+        self._thread.start()
+
+    def touch(self, session_id):
+        self._last_seen[session_id] = time.monotonic()
+
+    def active(self):
+        cutoff = time.monotonic() - self.active_window
+        return sum(1 for seen in list(self._last_seen.values()) if seen >= cutoff)
+
+    # Estimated bytes held by one session; None if its state changed while
+    # it was being measured (it is measured again on the next sweep)
+    @staticmethod
+    def measure(session):
+        try:
+            return util.footprint(session.session_state)
+        except RuntimeError:
+            return None
+
+    def sweep(self):
+        with self._lock:
+            now = time.monotonic()
+            sizes = {}
+            kept = set()
+            evicted = {"idle": 0, "over_cap": 0}
+            reclaimed = 0
+            for session_id, session in live_sessions():
+                # A session that has not run the page yet is timed from now
+                seen = self._last_seen.setdefault(session_id, now)
+                size = self.measure(session)
+                if now - seen > self.idle_timeout:
+                    reason = "idle"
+                elif size is not None and size > self.max_bytes:
+                    reason = "over_cap"
+                else:
+                    kept.add(session_id)
+                    if size is not None:
+                        sizes[session_id] = size
+                    continue
+                close_session(session_id)
+                evicted[reason] += 1
+                reclaimed += size or 0
+            for session_id in list(self._last_seen):
+                if session_id not in kept:
+                    del self._last_seen[session_id]
+            self.sizes = sizes
+            for reason, count in evicted.items():
+                self.reaped[reason] += count
+            self.reclaimed_bytes += reclaimed
+        if evicted["idle"] or evicted["over_cap"]:
+            logger.info("closed %d idle and %d over-cap sessions, reclaiming ~%d KiB; %d sessions hold ~%d KiB",
+                        evicted["idle"], evicted["over_cap"], reclaimed // 1024,
+                        len(sizes), sum(sizes.values()) // 1024)
+        return evicted, reclaimed
+
+    def stats(self):
+        sizes = self.sizes
+        return {
+            "sessions": len(sizes),
+            "bytes": sum(sizes.values()),
+            "largest_bytes": max(sizes.values(), default=0),
+            "reaped_idle": self.reaped["idle"],
+            "reaped_over_cap": self.reaped["over_cap"],
+            "reclaimed_bytes": self.reclaimed_bytes,
+        }
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception:
+                logger.warning("session sweep failed; sessions are not being reaped", exc_info=True)
@@ -0,0 +1,192 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import assets
+
+logger = logging.getLogger(__name__)
+
+DATABASE = os.path.join(assets.DATA_DIR, "messages.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    received_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT NOT NULL,
+    profile TEXT NOT NULL DEFAULT 'default'
+)
+"""
+
+_STOP = object()
+
+# Rows written to SQLite by a background thread.
+#
+# put() never touches the disk: it puts the row on a bounded queue and
+# returns at once, or returns False when the queue is full so the caller can
+# shed load. The writer thread drains the queue in batches and commits each
+# batch in one transaction (group commit), so a burst of rows costs one
+# fsync rather than one per row. Transient failures (a locked database, disk
+# I/O errors) are retried with exponential backoff while the batch is held in
+# memory, up to `max_attempts` times. A batch that still fails, or fails any
+# other way (a constraint violation, a corrupt database, a bug in _write), is
+# appended to <path>.failed.jsonl and dropped, so one bad batch cannot stall
+# the writer and fill the queue. Subclasses set `schema` and write a batch in
+# _write().
+class BatchWriter:
+    schema = None
+
+    def __init__(self, path, max_queue=1000, batch_size=100,
+                 batch_wait=0.2, max_backoff=30.0, max_attempts=8, name="batch-writer"):
+        self.path = path
+        self.failed_path = path + ".failed.jsonl"
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.written = 0
+        self.rejected = 0
+        self.dropped = 0
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, row):
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.rejected += 1
+            return False
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    # Flush what is queued and stop the writer thread
+    def close(self, timeout=5.0):
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("%s queue still full at shutdown", self._thread.name)
+                return
+            self._thread.join(timeout)
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.schema)
+        conn.commit()
+        return conn
+
+    # Block for the first message, then gather more until the batch is full
+    # or batch_wait has passed
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, conn, batch):
+        raise NotImplementedError
+
+    # Keep a batch that cannot be written where it can be inspected and
+    # replayed by hand, and carry on with the next one
+    def _drop(self, batch):
+        self.dropped += len(batch)
+        try:
+            with open(self.failed_path, "a", encoding="utf-8") as f:
+                for row in batch:
+                    f.write(json.dumps(list(row), ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            logger.exception("dropped %d rows for %s; could not save them to %s",
+                             len(batch), self.path, self.failed_path)
+            return
+        logger.error("dropped %d rows for %s; saved to %s", len(batch), self.path, self.failed_path)
+
+    def _run(self):
+        conn = None
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            delay = 0.1
+            attempts = 0
+            while batch:
+                attempts += 1
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                    self._write(conn, batch)
+                    self.written += len(batch)
+                    batch = []
+                    continue
+                except (sqlite3.OperationalError, OSError):
+                    if attempts < self.max_attempts:
+                        logger.warning("writing %d rows to %s failed; retrying in %.1fs",
+                                       len(batch), self.path, delay, exc_info=True)
+                    else:
+                        logger.exception("writing %d rows to %s failed %d times", len(batch), self.path, attempts)
+                        self._drop(batch)
+                        batch = []
+                except Exception:
+                    logger.exception("writing %d rows to %s failed and will not be retried", len(batch), self.path)
+                    self._drop(batch)
+                    batch = []
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                if batch:
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_backoff)
+        if conn is not None:
+            conn.close()
+
+# Contact form submissions
+class SubmissionWriter(BatchWriter):
+    schema = SCHEMA
+
+    def __init__(self, path=DATABASE, **options):
+        super().__init__(path, name="submission-writer", **options)
+
+    # `profile` is the portfolio the message was sent from
+    def submit(self, name, email, subject, message, profile="default"):
+        return self.put((time.time(), name, email, subject, message, profile))
+
+    # Databases from before multi-profile hosting have no profile column;
+    # their messages were all sent to the default profile
+    def _connect(self):
+        conn = super()._connect()
+        if "profile" not in [row[1] for row in conn.execute("PRAGMA table_info(messages)")]:
+            conn.execute("ALTER TABLE messages ADD COLUMN profile TEXT NOT NULL DEFAULT 'default'")
+            conn.commit()
+        return conn
+
+    def _write(self, conn, batch):
+        with conn:
+            conn.executemany(
+                "INSERT INTO messages (received_at, name, email, subject, message, profile) VALUES (?, ?, ?, ?, ?, ?)",
+                batch,
+            )
@@ -0,0 +1,12 @@
+import components
+
+# Markup and a plain str with the same text must not share a cached fragment,
+# whichever of them is rendered first
+def test_markup_and_str_are_cached_apart():
+    markup = components.html_list(["a"])
+    for first, second in ((markup, str(markup)), (str(markup), markup)):
+        components.fragments.clear()
+        results = {type(value): components.card(value) for value in (first, second)}
+        assert "<ul>" in results[components.Markup]
+        assert "&lt;ul&gt;" in results[str]
+        assert "<ul>" not in results[str]
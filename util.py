@@ -0,0 +1,59 @@
+import os
+import re
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MARKDOWN_RE = re.compile(r"[*_`#]+")
+
+# Content text with its Markdown emphasis stripped, for places that are not
+# Markdown (search documents, the resume PDF)
+def plain(text):
+    return MARKDOWN_RE.sub("", text)
+
+# Write through a temporary file and rename, so a crashed or concurrent build
+# never leaves a half-written file under its final name
+def write_atomic(path, write):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+# Approximate bytes held by an object graph. Objects reachable twice (such
+# as strings shared between the content and an index) are counted once.
+def footprint(obj, seen=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)  # includes the data of numpy arrays
+    if isinstance(obj, dict):
+        size += sum(footprint(k, seen) + footprint(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(footprint(item, seen) for item in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += footprint(vars(obj), seen)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += footprint(getattr(obj, slot), seen)
+    return size
+
+# Request handler base for the app's side servers (metrics, content API);
+# their requests are counted in metrics rather than logged one per line
+class QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+# Serve `handler` on host:port from a daemon thread, one thread per request
+def serve_http(handler, host, port, name):
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=name, daemon=True).start()
+    return server